@@ -5,21 +5,34 @@ Provides charts for attack analysis including:
 - Attack Type Distribution (Normal, Tip, After Block)
 - Attack Quality Distribution by Set
 """
-from typing import List, Dict, Any, Optional
+from typing import Dict, Optional
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-from config import OUTCOME_COLORS, CHART_HEIGHTS, ATTACK_TYPE_COLORS
-from charts.utils import apply_beautiful_theme, plotly_config
+from config import OUTCOME_COLORS, ATTACK_TYPE_COLORS
+from charts.utils import plotly_config, frame_fingerprint, donut_template, ChartContext
+from charts.team_charts import get_played_sets
 
+# Columns the attack charts read (attack type comes as Attack_Type or attack_type)
+ATTACK_CHART_COLUMNS = ['set_number', 'action', 'outcome', 'Attack_Type', 'attack_type']
 
-def get_played_sets(df: pd.DataFrame, loader=None) -> List[int]:
-    """Get list of sets that were actually played."""
-    from charts.team_charts import get_played_sets as _get_played_sets
-    return _get_played_sets(df, loader)
+# Attack quality buckets in legend order, and the outcome -> bucket mapping
+ATTACK_QUALITY_ORDER = ['Kills', 'Defended', 'Errors']
+ATTACK_QUALITY_BUCKET = {
+    'kill': 'Kills',
+    'defended': 'Defended',
+    'good': 'Defended',
+    'blocked': 'Errors',  # error removed
+    'out': 'Errors',
+    'net': 'Errors',
+}
+ATTACK_QUALITY_OUTCOMES = list(ATTACK_QUALITY_BUCKET)
+# Lookup table from outcome code (position in ATTACK_QUALITY_OUTCOMES) to bucket index
+_QUALITY_BUCKET_LUT = np.array([ATTACK_QUALITY_ORDER.index(ATTACK_QUALITY_BUCKET[o]) for o in ATTACK_QUALITY_OUTCOMES])
 
 
-def create_attacking_performance_charts(df: pd.DataFrame, loader=None) -> None:
+def create_attacking_performance_charts(df: pd.DataFrame, loader=None,
+                                        ctx: Optional[ChartContext] = None) -> None:
     """Create all attacking performance charts.
     
     Includes:
@@ -29,26 +42,46 @@ def create_attacking_performance_charts(df: pd.DataFrame, loader=None) -> None:
     Args:
         df: Match dataframe
         loader: Optional loader instance
+        ctx: Optional shared ChartContext built by the section coordinator
     """
-    played_sets = get_played_sets(df, loader)
+    # Only these columns are read below; narrowing first keeps every mask/copy small
+    df = df[[c for c in ATTACK_CHART_COLUMNS if c in df.columns]]
+    if ctx is None:
+        ctx = ChartContext.from_df(df, get_played_sets(df, loader))
+    played_sets = ctx.played_sets
     
     # Shared set selector
     set_options = ['All Sets'] + [f'Set {s}' for s in played_sets]
     selected_set = st.selectbox("Select Set", set_options, key="attack_charts_set_selector")
     
+    # Filter to the selected set once and share it between both charts
+    if selected_set == 'All Sets':
+        set_df = df
+        set_num = None
+        key_suffix = "all"
+    else:
+        set_num = int(selected_set.split()[-1])
+        set_df = df[df['set_number'] == set_num]
+        key_suffix = f"set_{set_num}"
+    
     # Display both charts side by side
     col1, col2 = st.columns(2)
     
     with col1:
-        _create_attack_type_charts(df, played_sets, loader, selected_set)
+        _create_attack_type_charts(set_df, selected_set, key_suffix)
     
     with col2:
-        _create_attack_quality_charts(df, played_sets, loader, selected_set)
+        _create_attack_quality_charts(ctx, set_num, selected_set, key_suffix)
 
 
-def _create_attack_type_charts(df: pd.DataFrame, played_sets: List[int], loader=None, selected_set: str = None) -> None:
-    """Create attack type distribution charts with set selector."""
-    from utils.breakdown_helpers import get_attack_breakdown_by_type
+def _create_attack_type_charts(set_df: pd.DataFrame, title: str, key_suffix: str) -> None:
+    """Create attack type distribution chart for the selected set.
+    
+    Args:
+        set_df: Match dataframe already filtered to the selected set
+        title: Selected set label ('All Sets' or 'Set N')
+        key_suffix: Suffix for the chart widget key
+    """
     
     # Fixed order for consistent legend
     attack_type_order = ['Normal', 'Tip']
@@ -57,22 +90,7 @@ def _create_attack_type_charts(df: pd.DataFrame, played_sets: List[int], loader=
         'Tip': ATTACK_TYPE_COLORS['tip']
     }
     
-    # Use provided selected_set or default to 'All Sets'
-    if selected_set is None:
-        set_options = ['All Sets'] + [f'Set {s}' for s in played_sets]
-        selected_set = st.selectbox("Select Set", set_options, key="attack_type_set_selector")
-    
-    # Determine which data to show
-    if selected_set == 'All Sets':
-        breakdown = get_attack_breakdown_by_type(df, loader)
-        title = "All Sets"
-        key_suffix = "all"
-    else:
-        set_num = int(selected_set.split()[-1])
-        filtered_df = df[df['set_number'] == set_num]
-        breakdown = get_attack_breakdown_by_type(filtered_df, loader)
-        title = f"Set {set_num}"
-        key_suffix = f"set_{set_num}"
+    breakdown = _attack_breakdown_by_type(set_df)
     
     # Display the chart
     if breakdown:
@@ -92,45 +110,44 @@ def _create_attack_type_charts(df: pd.DataFrame, played_sets: List[int], loader=
         st.info("No attack data available")
 
 
-def _create_attack_quality_charts(df: pd.DataFrame, played_sets: List[int], loader=None, selected_set: str = None) -> None:
-    """Create attack quality distribution charts with set selector."""
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _attack_breakdown_by_type(df: pd.DataFrame) -> Dict[str, Dict[str, int]]:
+    """Cached get_attack_breakdown_by_type so set selector changes skip the recount."""
+    from utils.breakdown_helpers import get_attack_breakdown_by_type
+    return get_attack_breakdown_by_type(df)
+
+
+def _create_attack_quality_charts(ctx: ChartContext, set_num: Optional[int], title: str, key_suffix: str) -> None:
+    """Create attack quality distribution chart for the selected set.
+    
+    Args:
+        ctx: Shared ChartContext for the match dataframe
+        set_num: Selected set number, or None for all sets
+        title: Selected set label ('All Sets' or 'Set N')
+        key_suffix: Suffix for the chart widget key
+    """
     
-    # Fixed order for consistent legend
-    quality_order = ['Kills', 'Defended', 'Errors']
     quality_color_map = {
         'Kills': OUTCOME_COLORS['kill'],  # Green for kills
         'Defended': '#4A90E2',  # Blue for defended (better contrast than light blue)
         'Errors': OUTCOME_COLORS['error']  # Red for errors
     }
     
-    # Use provided selected_set or default to 'All Sets'
-    if selected_set is None:
-        set_options = ['All Sets'] + [f'Set {s}' for s in played_sets]
-        selected_set = st.selectbox("Select Set", set_options, key="attack_quality_set_selector")
-    
-    # Determine which data to show
-    if selected_set == 'All Sets':
-        filtered_df = df
-        title = "All Sets"
-        key_suffix = "all"
-    else:
-        set_num = int(selected_set.split()[-1])
-        filtered_df = df[df['set_number'] == set_num]
-        title = f"Set {set_num}"
-        key_suffix = f"set_{set_num}"
-    
     # Calculate attack quality data
-    attacks = filtered_df[filtered_df['action'] == 'attack']
-    kills = len(attacks[attacks['outcome'] == 'kill'])
-    defended = len(attacks[attacks['outcome'].isin(['defended', 'good'])])
-    errors = len(attacks[attacks['outcome'].isin(['blocked', 'out', 'net'])])  # error removed
-    total = kills + defended + errors
+    # Encode attack outcomes as integer codes, map them to buckets through the LUT
+    # and count all three buckets in one bincount pass
+    attack_outcomes = ctx.outcome_arr[ctx.action_mask('attack', set_num)]
+    codes = pd.Categorical(attack_outcomes, categories=ATTACK_QUALITY_OUTCOMES).codes
+    bucket_counts = np.bincount(np.take(_QUALITY_BUCKET_LUT, codes[codes >= 0]),
+                                minlength=len(ATTACK_QUALITY_ORDER))
+    quality_data = {bucket: int(count) for bucket, count in zip(ATTACK_QUALITY_ORDER, bucket_counts)}
+    total = sum(quality_data.values())
     
     # Display the chart
     if total > 0:
         _create_attack_quality_donut(
-            {'Kills': kills, 'Defended': defended, 'Errors': errors},
-            quality_order, quality_color_map, title, total,
+            quality_data,
+            ATTACK_QUALITY_ORDER, quality_color_map, title, total,
             f"attack_quality_donut_{key_suffix}"
         )
     else:
@@ -155,25 +172,8 @@ def _create_attack_type_donut(attack_data: dict, order: list, color_map: dict,
         st.info("No data available")
         return
     
-    fig = go.Figure(data=[go.Pie(
-        labels=labels,
-        values=values,
-        hole=0.4,
-        marker=dict(colors=colors, line=dict(color='white', width=2)),
-        textinfo='percent+label',
-        textfont=dict(size=14, color='#050d76', family='Inter, sans-serif'),
-        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>',
-        domain=dict(x=[0, 1], y=[0.15, 0.95])
-    )])
-    
-    fig = apply_beautiful_theme(fig, "", legend_position='bottom')
-    
-    fig.update_layout(
-        title=dict(text="Attack Type Distribution", font=dict(size=14, color='#050d76'), x=0.5, xanchor='center'),
-        height=350,
-        showlegend=False,
-        margin=dict(l=0, r=0, t=50, b=40)
-    )
+    fig = donut_template("Attack Type Distribution")
+    fig.update_traces(labels=labels, values=values, marker_colors=colors)
     
     st.plotly_chart(fig, use_container_width=True, config=plotly_config, key=key)
 
@@ -196,25 +196,8 @@ def _create_attack_quality_donut(quality_data: dict, order: list, color_map: dic
         st.info("No data available")
         return
     
-    fig = go.Figure(data=[go.Pie(
-        labels=labels,
-        values=values,
-        hole=0.4,
-        marker=dict(colors=colors, line=dict(color='white', width=2)),
-        textinfo='percent+label',
-        textfont=dict(size=14, color='#050d76', family='Inter, sans-serif'),
-        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>',
-        domain=dict(x=[0, 1], y=[0.15, 0.95])
-    )])
-    
-    fig = apply_beautiful_theme(fig, "", legend_position='bottom')
-    
-    fig.update_layout(
-        title=dict(text="Attack Quality Distribution", font=dict(size=14, color='#050d76'), x=0.5, xanchor='center'),
-        height=350,
-        showlegend=False,
-        margin=dict(l=0, r=0, t=50, b=40)
-    )
+    fig = donut_template("Attack Quality Distribution")
+    fig.update_traces(labels=labels, values=values, marker_colors=colors)
     
     st.plotly_chart(fig, use_container_width=True, config=plotly_config, key=key)
 
@@ -7,31 +7,44 @@ Provides charts for block analysis including:
 """
 from typing import List, Optional
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from config import OUTCOME_COLORS, CHART_HEIGHTS
-from charts.utils import apply_beautiful_theme, plotly_config
+from config import OUTCOME_COLORS, ACTION_OUTCOME_MAP
+from charts.utils import apply_beautiful_theme, plotly_config, frame_fingerprint, donut_template, ChartContext
+from charts.team_charts import get_played_sets
 
+# Block outcomes in display order (Kill, Block No Kill, Touch, No Touch, Error)
+BLOCK_OUTCOMES = ACTION_OUTCOME_MAP['block']
 
-def get_played_sets(df: pd.DataFrame, loader=None) -> List[int]:
-    """Get list of sets that were actually played."""
-    from charts.team_charts import get_played_sets as _get_played_sets
-    return _get_played_sets(df, loader)
+# Stacked bar traces for the by-set chart: (outcome, legend name, color)
+_BLOCK_TREND_TRACES = [
+    ('kill', 'Kills', OUTCOME_COLORS['kill']),
+    # Block - No Kill → Light green (better than Touch - ball went back but didn't finish point)
+    ('block_no_kill', 'Block - No Kill', OUTCOME_COLORS['good']),
+    ('touch', 'Touches', OUTCOME_COLORS.get('block_no_kill', '#FF9800')),  # Orange
+    ('no_touch', 'No Touch', OUTCOME_COLORS.get('no_touch', '#999999')),  # Gray
+    ('error', 'Errors', OUTCOME_COLORS['error']),  # Red
+]
 
 
-def create_blocking_performance_charts(df: pd.DataFrame, loader=None) -> None:
+def create_blocking_performance_charts(df: pd.DataFrame, loader=None,
+                                       ctx: Optional[ChartContext] = None) -> None:
     """Create all blocking performance charts.
     
     Includes:
     - Block Performance Distribution (donut chart)
-    - Block Kill % by Set (trend chart)
+    - Block Kill % by Set (trend chart, shown on demand via a toggle)
     Both displayed side-by-side with a shared set selector.
     
     Args:
         df: Match dataframe
         loader: Optional loader instance
+        ctx: Optional shared ChartContext built by the section coordinator
     """
-    played_sets = get_played_sets(df, loader)
+    # Only these columns are read below; narrowing first keeps every mask/copy small
+    df = df[['set_number', 'action', 'outcome']]
+    played_sets = ctx.played_sets if ctx is not None else get_played_sets(df, loader)
     
     # Fixed order for consistent legend: Kills, Block - No Kill, Touches, No Touch, Errors
     # Block - No Kill is better than Touch (ball went back but didn't finish point vs just touched)
@@ -48,37 +61,64 @@ def create_blocking_performance_charts(df: pd.DataFrame, loader=None) -> None:
     set_options = ['All Sets'] + [f'Set {s}' for s in played_sets]
     selected_set = st.selectbox("Select Set", set_options, key="blocking_set_selector")
     
+    # Block outcome counts for every set, cached across reruns of the same data
+    block_counts = _block_counts_by_set(df)
+    
     # Display both charts side by side
     col1, col2 = st.columns(2)
     
     with col1:
-        _create_block_distribution_chart(df, played_sets, loader, selected_set, block_order, block_color_map)
+        _create_block_distribution_chart(block_counts, played_sets, loader, selected_set,
+                                         block_order, block_color_map)
     
     with col2:
-        _create_block_kill_trend_chart(df, played_sets, loader, selected_set)
+        # The by-set breakdown is opt-in so the default render only builds the donut
+        if st.toggle("Show by-set breakdown", value=False, key="block_trend_toggle"):
+            _create_block_kill_trend_chart(block_counts, played_sets, loader, selected_set)
 
 
-def _create_block_distribution_chart(df: pd.DataFrame, played_sets: List[int], loader=None, 
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _block_counts_by_set(df: pd.DataFrame) -> pd.DataFrame:
+    """Count block outcomes per set.
+    
+    Args:
+        df: Match dataframe
+        
+    Returns:
+        DataFrame indexed by set number with one column per block outcome
+    """
+    block_mask = df['action'].to_numpy() == 'block'
+    set_codes, sets = pd.factorize(df['set_number'].to_numpy()[block_mask], sort=True, use_na_sentinel=False)
+    outcome_codes = pd.Categorical(df['outcome'].to_numpy()[block_mask], categories=BLOCK_OUTCOMES).codes
+    
+    # One histogram pass over (set, outcome) code pairs; unknown outcomes have code -1
+    known = outcome_codes >= 0
+    n_outcomes = len(BLOCK_OUTCOMES)
+    flat = np.bincount(set_codes[known] * n_outcomes + outcome_codes[known], minlength=len(sets) * n_outcomes)
+    return pd.DataFrame(flat.reshape(len(sets), n_outcomes), index=pd.Index(sets, name='set_number'),
+                        columns=BLOCK_OUTCOMES)
+
+
+def _create_block_distribution_chart(block_counts: pd.DataFrame, played_sets: List[int], loader=None,
                                      selected_set: str = None, block_order: List[str] = None,
                                      block_color_map: dict = None) -> None:
     """Create block performance distribution chart with set selector."""
     
     # Determine which data to show
     if selected_set == 'All Sets':
-        filtered_df = df
+        outcome_counts = block_counts.sum()
         key_suffix = "all"
     else:
         set_num = int(selected_set.split()[-1])
-        filtered_df = df[df['set_number'] == set_num]
+        outcome_counts = block_counts.loc[set_num] if set_num in block_counts.index else pd.Series(dtype=int)
         key_suffix = f"set_{set_num}"
     
     # Calculate blocking data
-    blocks = filtered_df[filtered_df['action'] == 'block']
-    kills = len(blocks[blocks['outcome'] == 'kill'])
-    touches = len(blocks[blocks['outcome'] == 'touch'])
-    block_no_kill = len(blocks[blocks['outcome'] == 'block_no_kill'])
-    no_touch = len(blocks[blocks['outcome'] == 'no_touch'])
-    errors = len(blocks[blocks['outcome'] == 'error'])
+    kills = int(outcome_counts.get('kill', 0))
+    touches = int(outcome_counts.get('touch', 0))
+    block_no_kill = int(outcome_counts.get('block_no_kill', 0))
+    no_touch = int(outcome_counts.get('no_touch', 0))
+    errors = int(outcome_counts.get('error', 0))
     total = kills + touches + block_no_kill + no_touch + errors
     
     # Display the chart
@@ -92,12 +132,10 @@ def _create_block_distribution_chart(df: pd.DataFrame, played_sets: List[int], l
         st.info("No block data available")
 
 
-def _create_block_kill_trend_chart(df: pd.DataFrame, played_sets: List[int], loader=None, 
+def _create_block_kill_trend_chart(block_counts: pd.DataFrame, played_sets: List[int], loader=None,
                                     selected_set: str = None) -> None:
     """Create stacked bar chart showing all block outcomes by set with same color scheme as reception chart."""
     
-    # Get block outcomes by set - similar to reception quality distribution
-    block_details_by_set = {}
     sets_to_process = played_sets
     
     # Filter sets if specific set selected
@@ -105,87 +143,46 @@ def _create_block_kill_trend_chart(df: pd.DataFrame, played_sets: List[int], loa
         set_num = int(selected_set.split()[-1])
         sets_to_process = [set_num] if set_num in played_sets else []
     
-    for set_num in sets_to_process:
-        set_df = df[df['set_number'] == set_num]
-        blocks = set_df[set_df['action'] == 'block']
-        
-        # Map block outcomes - separate all categories like the donut chart
-        block_details_by_set[set_num] = {
-            'kill': len(blocks[blocks['outcome'] == 'kill']),
-            'touch': len(blocks[blocks['outcome'] == 'touch']),
-            'block_no_kill': len(blocks[blocks['outcome'] == 'block_no_kill']),
-            'no_touch': len(blocks[blocks['outcome'] == 'no_touch']),
-            'error': len(blocks[blocks['outcome'] == 'error'])
-        }
-    
-    if not block_details_by_set or not any(sum(v.values()) > 0 for v in block_details_by_set.values()):
+    # One row per set to plot, one column per block outcome
+    counts = block_counts.reindex(index=sets_to_process, fill_value=0)
+    
+    if counts.to_numpy().sum() == 0:
         st.info("No block data available")
         return
     
-    # Create stacked bar chart
-    fig = go.Figure()
+    # Reuse the cached figure and only swap the per-set arrays; the stable key lets the
+    # browser patch the existing chart instead of rebuilding it on every set change
+    fig = _block_outcomes_figure()
+    x_labels = [f"Set {s}" for s in sets_to_process]
+    for trace, (outcome, _, _) in zip(fig.data, _BLOCK_TREND_TRACES):
+        values = counts[outcome].to_numpy()
+        trace.update(x=x_labels, y=values, text=values.astype(str))
+    st.plotly_chart(fig, use_container_width=True, config=plotly_config, key="block_outcomes")
+
+
+@st.cache_data(show_spinner=False)
+def _block_outcomes_figure() -> go.Figure:
+    """Build the styled (empty) stacked bar figure for block outcomes by set.
     
+    Layout and theming never change between reruns, so the figure is built once
+    and callers only fill in the x/y/text arrays.
+    """
     # Use same color scheme as donut chart - must match exactly
-    # Kill
-    fig.add_trace(go.Bar(
-        x=[f"Set {s}" for s in sets_to_process],
-        y=[block_details_by_set.get(s, {}).get('kill', 0) for s in sets_to_process],
-        name='Kills',
-        marker_color=OUTCOME_COLORS['kill'],  # Match donut chart
-        text=[block_details_by_set.get(s, {}).get('kill', 0) for s in sets_to_process],
-        textposition='inside',
-        textfont=dict(size=9, color='#FFFFFF')
-    ))
-    
-    # Block - No Kill → Light green (better than Touch - ball went back but didn't finish point)
-    fig.add_trace(go.Bar(
-        x=[f"Set {s}" for s in sets_to_process],
-        y=[block_details_by_set.get(s, {}).get('block_no_kill', 0) for s in sets_to_process],
-        name='Block - No Kill',
-        marker_color=OUTCOME_COLORS['good'],  # Light green - match donut chart
-        text=[block_details_by_set.get(s, {}).get('block_no_kill', 0) for s in sets_to_process],
-        textposition='inside',
-        textfont=dict(size=9, color='#FFFFFF')
-    ))
-    
-    # Touch → Orange
-    fig.add_trace(go.Bar(
-        x=[f"Set {s}" for s in sets_to_process],
-        y=[block_details_by_set.get(s, {}).get('touch', 0) for s in sets_to_process],
-        name='Touches',
-        marker_color=OUTCOME_COLORS.get('block_no_kill', '#FF9800'),  # Orange - match donut chart
-        text=[block_details_by_set.get(s, {}).get('touch', 0) for s in sets_to_process],
-        textposition='inside',
-        textfont=dict(size=9, color='#FFFFFF')
-    ))
-    
-    # No Touch → Gray
-    fig.add_trace(go.Bar(
-        x=[f"Set {s}" for s in sets_to_process],
-        y=[block_details_by_set.get(s, {}).get('no_touch', 0) for s in sets_to_process],
-        name='No Touch',
-        marker_color=OUTCOME_COLORS.get('no_touch', '#999999'),  # Gray - match donut chart
-        text=[block_details_by_set.get(s, {}).get('no_touch', 0) for s in sets_to_process],
-        textposition='inside',
-        textfont=dict(size=9, color='#FFFFFF')
-    ))
-    
-    # Error → Red
-    fig.add_trace(go.Bar(
-        x=[f"Set {s}" for s in sets_to_process],
-        y=[block_details_by_set.get(s, {}).get('error', 0) for s in sets_to_process],
-        name='Errors',
-        marker_color=OUTCOME_COLORS['error'],  # Red - match donut chart
-        text=[block_details_by_set.get(s, {}).get('error', 0) for s in sets_to_process],
-        textposition='inside',
-        textfont=dict(size=9, color='#FFFFFF')
-    ))
-    
-    # Calculate total block attempts for sample size
-    total_block_attempts = sum(sum(block_details_by_set.get(s, {}).values()) for s in sets_to_process)
+    # Build all traces up front so the figure validates them in one constructor call
+    fig = go.Figure(data=[
+        go.Bar(
+            x=[],
+            y=[],
+            name=name,
+            marker_color=color,
+            text=[],
+            textposition='inside',
+            textfont=dict(size=9, color='#FFFFFF')
+        )
+        for _, name, color in _BLOCK_TREND_TRACES
+    ])
     
     fig.update_layout(
-        title=f"Block Outcomes Distribution (n={total_block_attempts} blocks)",
         xaxis_title="Set Number",
         yaxis_title="Count",
         barmode='stack',
@@ -196,7 +193,7 @@ def _create_block_kill_trend_chart(df: pd.DataFrame, played_sets: List[int], loa
     fig = apply_beautiful_theme(fig, "Block Outcomes Distribution", height=350)
     # Override height and margins after theme to match donut chart height (350px)
     fig.update_layout(height=350, margin=dict(l=40, r=30, t=50, b=40))
-    st.plotly_chart(fig, use_container_width=True, config=plotly_config, key=f"block_outcomes_{selected_set}")
+    return fig
 
 
 def _create_block_donut_chart(block_data: dict, block_order: list, 
@@ -217,26 +214,8 @@ def _create_block_donut_chart(block_data: dict, block_order: list,
         st.info("No block data available")
         return
     
-    fig = go.Figure(data=[go.Pie(
-        labels=labels,
-        values=values,
-        hole=0.4,
-        marker=dict(colors=colors, line=dict(color='white', width=2)),
-        textinfo='percent+label',
-        textfont=dict(size=14, color='#050d76', family='Inter, sans-serif'),
-        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>',
-        domain=dict(x=[0, 1], y=[0, 1])
-    )])
-    
-    fig = apply_beautiful_theme(fig, "", legend_position='bottom')
-    
-    fig.update_layout(
-        title=dict(text="Block Performance Distribution", font=dict(size=14, color='#050d76'), x=0.5, xanchor='center'),
-        height=350,
-        showlegend=False,
-        margin=dict(l=20, r=20, t=50, b=40),
-        autosize=True
-    )
+    fig = donut_template("Block Performance Distribution", domain_y=(0, 1), side_margin=20, autosize=True)
+    fig.update_traces(labels=labels, values=values, marker_colors=colors)
     
     st.plotly_chart(fig, use_container_width=True, config=plotly_config, key=key)
 
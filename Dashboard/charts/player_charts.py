@@ -1,156 +1,349 @@
 """
 Player chart generation module
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Optional, Tuple
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 from match_analyzer import MatchAnalyzer
-from config import CHART_COLORS, OUTCOME_COLORS, CHART_HEIGHTS
-from charts.utils import apply_beautiful_theme, plotly_config
-from utils.helpers import get_player_df
+from config import (OUTCOME_COLORS, CHART_HEIGHTS, ATTACK_ERROR_OUTCOMES, GOOD_PASS_OUTCOMES,
+                    GOOD_SET_OUTCOMES, ATTACK_TYPE_COLORS)
+from charts.utils import apply_beautiful_theme, plotly_config, frame_fingerprint, outcome_counts_by_set, player_position
+from charts.team_charts import get_played_sets
+from utils.helpers import get_player_df, get_player_mask
 
+# Action donut colors, aligned with dashboard palette
+ACTION_DISTRIBUTION_COLORS = {
+    'attack': '#F5A623',        # orange
+    'serve': '#00B5AD',         # teal
+    'receive': '#7ED321',       # green
+    'set': '#4A6CF7',           # blue
+    'block': '#9013FE',         # purple
+    'dig': '#BD10E0'            # magenta
+}
 
-def get_played_sets(df: pd.DataFrame, loader=None) -> List[int]:
-    """
-    Detect which sets were actually played (have data).
-    Same function as in team_charts.py - import it to avoid duplication.
-    """
-    from charts.team_charts import get_played_sets as _get_played_sets
-    return _get_played_sets(df, loader)
+# Outcome donut buckets (unknown outcomes count as Neutral)
+OUTCOME_DISTRIBUTION_BUCKETS = {
+    'kill': 'Kills',
+    'ace': 'Kills',
+    'good': 'Positive',
+    'exceptional': 'Positive',
+    'perfect': 'Positive',
+    'touch': 'Neutral',
+    'defended': 'Neutral',
+    'poor': 'Neutral',
+    'error': 'Errors',
+    'blocked': 'Errors',
+    'out': 'Errors',
+    'net': 'Errors',
+    'no_touch': 'Neutral',
+    'block_no_kill': 'Neutral'
+}
+
+OUTCOME_DISTRIBUTION_ORDER = ['Kills', 'Positive', 'Neutral', 'Errors']
+OUTCOME_DISTRIBUTION_COLORS = [
+    OUTCOME_COLORS.get('kill', '#4CAF50'),
+    OUTCOME_COLORS.get('good', '#8BC34A'),
+    '#F5A623',
+    OUTCOME_COLORS.get('error', '#FF6B6B')
+]
+
+# Outcomes tallied by the generic "Outcomes by Set" chart (Kills = kill + ace, Good includes passes/touches)
+SET_OUTCOME_COLUMNS = ['kill', 'ace', 'good', 'defended', 'perfect', 'touch', 'error']
+SET_GOOD_OUTCOMES = ['good', 'defended', 'perfect', 'touch']
+
+# (outcome, label, color) slices shown by the outcome breakdown charts, in display order
+ATTACK_OUTCOME_BREAKDOWN = [
+    ('kill', 'Kill', OUTCOME_COLORS.get('kill', '#28A745')),
+    ('defended', 'Defended', OUTCOME_COLORS.get('defended', '#B0E0E6')),
+    ('blocked', 'Blocked', OUTCOME_COLORS.get('blocked', '#DC3545')),
+    ('out', 'Out', OUTCOME_COLORS.get('out', '#DC3545')),
+    ('net', 'Net', OUTCOME_COLORS.get('net', '#DC3545'))
+]
+PASS_OUTCOME_BREAKDOWN = [
+    ('perfect', 'Perfect', OUTCOME_COLORS.get('perfect', '#28A745')),
+    ('good', 'Good', OUTCOME_COLORS.get('good', '#6CBF47')),
+    ('poor', 'Poor', OUTCOME_COLORS.get('poor', '#FFC107')),
+    ('error', 'Error', OUTCOME_COLORS.get('error', '#DC3545'))
+]
+BLOCK_OUTCOME_BREAKDOWN = [
+    ('kill', 'Kills', OUTCOME_COLORS['kill']),
+    ('block_no_kill', 'Block - No Kill', OUTCOME_COLORS['good']),
+    ('touch', 'Touches', OUTCOME_COLORS.get('block_no_kill', '#FF9800')),
+    ('no_touch', 'No Touch', OUTCOME_COLORS.get('no_touch', '#999999')),
+    ('error', 'Errors', OUTCOME_COLORS['error'])
+]
+SETTING_OUTCOME_BREAKDOWN = [
+    ('exceptional', 'Exceptional', OUTCOME_COLORS['perfect']),
+    ('good', 'Good', OUTCOME_COLORS['good']),
+    ('poor', 'Poor', OUTCOME_COLORS['poor']),
+    ('error', 'Error', OUTCOME_COLORS['error'])
+]
+
+# Position code prefixes that get the attacker/blocker charts (OPP is matched exactly)
+ATTACKER_POSITION_PREFIXES = frozenset({'OH', 'MB'})
 
 
+@st.fragment
 def create_player_charts(analyzer: MatchAnalyzer, player_name: str, loader=None) -> None:
     """Create all player performance charts.
     
+    Runs as a fragment so widget interactions inside the charts only rerun
+    this section instead of the whole page.
+    
     Args:
         analyzer: MatchAnalyzer instance
         player_name: Name of the player
         loader: Optional ExcelMatchLoader instance for detecting played sets
     """
     df = analyzer.match_data
-    player_df = get_player_df(df, player_name)
+    # Detect played sets once; helpers get the tuple instead of re-detecting
+    played_sets = tuple(get_played_sets(df, loader))
+    player_df = _filter_player_df(df, player_name, played_sets)
     
-    # Filter player data to only played sets
-    played_sets = get_played_sets(df, loader)
-    if played_sets:
-        player_df = player_df[player_df['set_number'].isin(played_sets)]
+    # Nothing to plot (e.g. bench player) - skip building empty figures
+    if player_df.empty:
+        st.info(f"No data available for {player_name}")
+        return
     
-    # Get player position
-    from utils.helpers import get_player_position
-    position = get_player_position(df, player_name)
+    # Get player position and resolve its chart branch once
+    position_class = _position_class(player_position(df, player_name))
     
     st.markdown("### 📊 Player Performance Charts")
     
-    # For setters: Show generic charts first, then setting-specific
-    is_setter = position == 'S' or (position and 'setter' in position.lower())
+    # Slice the player's rows by action in one pass; helpers get the frames they need
+    by_action = dict(tuple(player_df.groupby('action', sort=False, observed=True)))
+    no_rows = player_df.iloc[:0]
+    # Sets this player appeared in (sorted), shared by every by-set chart below
+    player_sets = np.unique(player_df['set_number'].to_numpy())
+    attacks = by_action.get('attack', no_rows)
+    blocks = by_action.get('block', no_rows)
+    receives = by_action.get('receive', no_rows)
+    digs = by_action.get('dig', no_rows)
     
-    if is_setter:
+    # For setters: Show generic charts first, then setting-specific
+    if position_class == 'setter':
         # Generic charts first for setters (overall numbers)
-        col1, col2 = st.columns(2)
-        with col1:
-            _create_action_distribution_chart(player_df)
-        with col2:
-            _create_outcome_distribution_chart(player_df)
+        _create_distribution_charts(player_df)
         
         # Then setting-specific charts
-        _create_setter_specific_charts(player_df, analyzer, player_name, loader)
+        _create_setter_specific_charts(player_sets, by_action.get('set', no_rows), analyzer, player_name, loader)
     else:
         # For other positions: Position-specific charts first
-        if position and (position.startswith('OH') or position == 'OPP' or position.startswith('MB')):
+        if position_class == 'attacker':
             # Attackers: Show attack-specific charts
-            _create_attacker_specific_charts(player_df, analyzer, player_name, loader)
-        elif position == 'L':
+            _create_attacker_specific_charts(attacks, analyzer, player_name, loader)
+        elif position_class == 'libero':
             # Liberos: Show reception/dig-specific charts
-            _create_libero_specific_charts(player_df, analyzer, player_name, loader)
+            _create_libero_specific_charts(player_sets, receives, digs, analyzer, player_name, loader)
         
         # Generic charts (for non-setters)
-        col1, col2 = st.columns(2)
-        with col1:
-            _create_action_distribution_chart(player_df)
-        with col2:
-            _create_outcome_distribution_chart(player_df)
+        _create_distribution_charts(player_df)
     
     # Performance by set (enhanced) - skip for liberos (redundant)
-    if position != 'L':
+    if position_class != 'libero':
         st.markdown("### 🎯 Performance by Set")
-        _create_performance_by_set_charts(player_df, analyzer, player_name, loader)
-    
-    # Add Attack Outcome Breakdown for attackers
-    if position and (position.startswith('OH') or position == 'OPP' or position.startswith('MB')):
-        _create_attack_outcome_breakdown(player_df, player_name)
+        _create_performance_by_set_charts(player_df, by_action, analyzer, player_name, position_class, played_sets,
+                                          player_sets)
     
-    # Add Block Efficiency Trends for blockers (MB, OPP, OH)
-    if position and (position.startswith('MB') or position == 'OPP' or position.startswith('OH')):
-        _create_block_efficiency_trends(player_df, player_name)
-        _create_block_breakdown_by_set(player_df, player_name)
+    # Add Attack Outcome Breakdown and Block Efficiency Trends for attackers/blockers (MB, OPP, OH)
+    if position_class == 'attacker':
+        _create_attack_outcome_breakdown(attacks, player_name)
+        _create_block_efficiency_trends(player_sets, blocks, player_name)
+        _create_block_breakdown_by_set(player_sets, blocks, player_name)
     
     # Add Reception & Dig Performance charts - grouped together for better organization
     # Show for any player with reception/dig data (including setters, but NOT liberos - redundant)
-    if position != 'L':
-        receives = player_df[player_df['action'] == 'receive']
-        digs = player_df[player_df['action'] == 'dig']
-        
-        if len(receives) > 0 or len(digs) > 0:
+    if position_class != 'libero':
+        if not receives.empty or not digs.empty:
             st.markdown("### 📥 Reception & Defense Performance")
             
-            if len(receives) > 0 and len(digs) > 0:
+            if not receives.empty and not digs.empty:
                 # Both charts side by side
                 col1, col2 = st.columns(2)
                 with col1:
                     _create_reception_performance_chart(receives, player_name)
                 with col2:
                     _create_dig_performance_chart(digs, player_name)
-            elif len(receives) > 0:
+            elif not receives.empty:
                 # Only reception chart
                 _create_reception_performance_chart(receives, player_name)
-            elif len(digs) > 0:
+            elif not digs.empty:
                 # Only dig chart
                 _create_dig_performance_chart(digs, player_name)
 
 
-def _create_attack_outcome_breakdown(player_df: pd.DataFrame, player_name: str) -> None:
-    """Create attack outcome breakdown chart showing all outcomes (Kill, Defended, Blocked, Out, Net)."""
-    attacks = player_df[player_df['action'] == 'attack']
+def _filter_player_df(df: pd.DataFrame, player_name: str, played_sets: tuple) -> pd.DataFrame:
+    """Get a player's rows limited to the played sets.
     
-    if len(attacks) == 0:
-        return
+    Args:
+        df: Match dataframe
+        player_name: Name of the player
+        played_sets: Played set numbers (empty to keep all sets)
+        
+    Returns:
+        Filtered player dataframe
+    """
+    if df.empty or 'player' not in df.columns:
+        return get_player_df(df, player_name)
     
-    st.markdown("#### 🏐 Attack Outcome Breakdown")
+    # Fuse the player and played-set conditions into one mask so the frame is copied once
+    mask = get_player_mask(df, player_name)
+    if played_sets:
+        mask = mask & np.isin(df['set_number'].to_numpy(), played_sets)
+    return df[mask]
+
+
+def _position_class(position: Optional[str]) -> Optional[str]:
+    """Map a position code to the chart branch it gets.
     
-    # Count all outcomes (error removed - all errors covered by out, net, blocked)
-    kills = len(attacks[attacks['outcome'] == 'kill'])
-    defended = len(attacks[attacks['outcome'] == 'defended'])
-    blocked = len(attacks[attacks['outcome'] == 'blocked'])
-    out = len(attacks[attacks['outcome'] == 'out'])
-    net = len(attacks[attacks['outcome'] == 'net'])
+    Args:
+        position: Position code (e.g. 'OH1', 'MB2', 'OPP', 'S', 'L') or None
+        
+    Returns:
+        'setter', 'attacker', 'libero', or None for unknown positions
+    """
+    if not position:
+        return None
+    if position == 'S' or 'setter' in position.lower():
+        return 'setter'
+    if position[:2] in ATTACKER_POSITION_PREFIXES or position == 'OPP':
+        return 'attacker'
+    if position == 'L':
+        return 'libero'
+    return None
+
+
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _all_player_set_outcome_counts(df: pd.DataFrame, played_sets: tuple) -> pd.DataFrame:
+    """Count outcomes per (player, set) for every player in one groupby, cached across reruns.
     
-    # Group outcomes
+    Args:
+        df: Match dataframe
+        played_sets: Played set numbers (empty to keep all sets)
+        
+    Returns:
+        Counts indexed by (normalized player name, set_number) with one column per outcome
+    """
+    if played_sets:
+        df = df[np.isin(df['set_number'].to_numpy(), played_sets)]
+    player_names = df['player'].fillna('').astype(str).str.strip().str.lower()
+    counts = df.groupby([player_names, 'set_number', 'outcome'], sort=False, observed=True, dropna=False).size()
+    counts = counts.unstack('outcome', fill_value=0)
+    counts.columns = counts.columns.astype(str)
+    return counts
+
+
+def _player_set_outcome_counts(df: pd.DataFrame, player_name: str, played_sets: tuple) -> pd.DataFrame:
+    """Get a player's set x outcome count table from the all-player aggregate.
+    
+    Args:
+        df: Match dataframe
+        player_name: Name of the player (matched like get_player_df)
+        played_sets: Played set numbers (empty to keep all sets)
+        
+    Returns:
+        Counts indexed by set_number with one column per outcome (empty if the player has no rows)
+    """
+    counts = _all_player_set_outcome_counts(df, played_sets)
+    player_key = player_name.strip().lower()
+    if player_key not in counts.index.get_level_values(0):
+        return pd.DataFrame()
+    return counts.loc[player_key]
+
+
+def _outcome_breakdown(outcomes: pd.Series, breakdown: list) -> tuple:
+    """Count outcomes in one pass and keep the non-zero slices in display order.
+    
+    Args:
+        outcomes: Outcome column of the rows to break down
+        breakdown: (outcome, label, color) tuples in display order
+        
+    Returns:
+        Tuple of (labels, values, colors) lists
+    """
+    counts = outcomes.value_counts()
     labels = []
     values = []
     colors_list = []
+    for outcome, label, color in breakdown:
+        count = int(counts.get(outcome, 0))
+        if count > 0:
+            labels.append(label)
+            values.append(count)
+            colors_list.append(color)
+    return labels, values, colors_list
+
+
+def _isin_mask(values: pd.Series, allowed) -> np.ndarray:
+    """Get a membership mask, comparing category codes instead of strings for categoricals.
+    
+    Args:
+        values: Column to test (e.g. outcome)
+        allowed: Values that count as a match
+        
+    Returns:
+        Boolean array aligned with values
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        allowed_codes = values.cat.categories.get_indexer(list(allowed))
+        return np.isin(values.cat.codes.to_numpy(), allowed_codes[allowed_codes >= 0])
+    return values.isin(allowed).to_numpy()
+
+
+def _pct_by_set(flags: pd.Series, set_numbers: pd.Series, played_sets: list) -> list:
+    """Get the percentage of flagged rows per set with two bincounts.
     
-    if kills > 0:
-        labels.append('Kill')
-        values.append(kills)
-        colors_list.append(OUTCOME_COLORS.get('kill', '#28A745'))
-    if defended > 0:
-        labels.append('Defended')
-        values.append(defended)
-        colors_list.append(OUTCOME_COLORS.get('defended', '#B0E0E6'))
-    if blocked > 0:
-        labels.append('Blocked')
-        values.append(blocked)
-        colors_list.append(OUTCOME_COLORS.get('blocked', '#DC3545'))
-    if out > 0:
-        labels.append('Out')
-        values.append(out)
-        colors_list.append(OUTCOME_COLORS.get('out', '#DC3545'))
-    if net > 0:
-        labels.append('Net')
-        values.append(net)
-        colors_list.append(OUTCOME_COLORS.get('net', '#DC3545'))
+    Args:
+        flags: Boolean flag per row (e.g. outcome is a kill)
+        set_numbers: Set number per row, aligned with flags
+        played_sets: Sets to report, in sorted x-axis order
+        
+    Returns:
+        Percentages in played_sets order (0 for sets without rows)
+    """
+    sets = np.asarray(played_sets)
+    set_numbers = np.asarray(set_numbers)
+    # Position of each row's set on the x-axis; rows outside played_sets are dropped
+    positions = np.searchsorted(sets, set_numbers)
+    in_sets = positions < len(sets)
+    in_sets[in_sets] = sets[positions[in_sets]] == set_numbers[in_sets]
+    positions = positions[in_sets]
+    attempts = np.bincount(positions, minlength=len(sets))
+    hits = np.bincount(positions, weights=np.asarray(flags, dtype=bool)[in_sets], minlength=len(sets))
+    pct = np.divide(hits, attempts, out=np.zeros(len(sets)), where=attempts > 0) * 100
+    return pct.tolist()
+
+
+def _count_pct_by_set(counts: pd.DataFrame, outcomes, played_sets: list) -> list:
+    """Get the percentage of rows with one of the given outcomes per set from a count table.
+    
+    Args:
+        counts: Counts indexed by set_number with one column per outcome
+        outcomes: Outcomes counted as hits
+        played_sets: Sets to report, in x-axis order
+        
+    Returns:
+        Percentages in played_sets order (0 for sets without rows)
+    """
+    counts = counts.reindex(played_sets, fill_value=0)
+    attempts = counts.to_numpy(dtype=np.float64).sum(axis=1)
+    hits = counts.reindex(columns=list(outcomes), fill_value=0).to_numpy(dtype=np.float64).sum(axis=1)
+    pct = np.divide(hits, attempts, out=np.zeros(len(attempts)), where=attempts > 0) * 100
+    return pct.tolist()
+
+
+def _create_attack_outcome_breakdown(attacks: pd.DataFrame, player_name: str) -> None:
+    """Create attack outcome breakdown chart showing all outcomes (Kill, Defended, Blocked, Out, Net)."""
+    if attacks.empty:
+        return
+    
+    st.markdown("#### 🏐 Attack Outcome Breakdown")
+    
+    # Count all outcomes (error removed - all errors covered by out, net, blocked)
+    labels, values, colors_list = _outcome_breakdown(attacks['outcome'], ATTACK_OUTCOME_BREAKDOWN)
     
     if labels:
         fig = go.Figure(data=[go.Bar(
@@ -174,31 +367,18 @@ def _create_attack_outcome_breakdown(player_df: pd.DataFrame, player_name: str)
         st.plotly_chart(fig, use_container_width=True, config=plotly_config, key=f"player_attack_outcomes_{player_name}")
 
 
-def _create_block_efficiency_trends(player_df: pd.DataFrame, player_name: str) -> None:
+def _create_block_efficiency_trends(player_sets: np.ndarray, blocks: pd.DataFrame, player_name: str) -> None:
     """Create block efficiency trends by set for blockers."""
-    blocks = player_df[player_df['action'] == 'block']
-    
-    if len(blocks) == 0:
+    if blocks.empty:
         return
     
     st.markdown("#### 🛡️ Block Efficiency Trends")
     
-    played_sets = sorted(player_df['set_number'].unique())
-    block_kill_pct_by_set = []
-    
-    for set_num in played_sets:
-        set_blocks = blocks[blocks['set_number'] == set_num]
-        block_kills = len(set_blocks[set_blocks['outcome'] == 'kill'])
-        block_total = len(set_blocks)
-        
-        if block_total > 0:
-            kill_pct = (block_kills / block_total) * 100
-            block_kill_pct_by_set.append(kill_pct)
-        else:
-            block_kill_pct_by_set.append(0)
+    # Kill % for every set in one groupby; sets without blocks show 0
+    block_kill_pct_by_set = _pct_by_set(blocks['outcome'] == 'kill', blocks['set_number'], player_sets)
     
     fig = go.Figure(data=go.Scatter(
-        x=[f"Set {s}" for s in played_sets],
+        x=[f"Set {s}" for s in player_sets],
         y=block_kill_pct_by_set,
         mode='lines+markers',
         name='Block Kill %',
@@ -219,94 +399,42 @@ def _create_block_efficiency_trends(player_df: pd.DataFrame, player_name: str) -
     st.plotly_chart(fig, use_container_width=True, config=plotly_config, key=f"player_block_trends_{player_name}")
 
 
-def _create_block_breakdown_by_set(player_df: pd.DataFrame, player_name: str) -> None:
+def _create_block_breakdown_by_set(player_sets: np.ndarray, blocks: pd.DataFrame, player_name: str) -> None:
     """Create stacked bar chart showing all block outcomes by set (kill, block_no_kill, touch, no_touch, error)."""
-    blocks = player_df[player_df['action'] == 'block']
-    
-    if len(blocks) == 0:
+    if blocks.empty:
         return
     
     st.markdown("#### 🛡️ Block Breakdown by Set")
     
-    played_sets = sorted(player_df['set_number'].unique())
+    # Block outcomes per set in one groupby; sets without blocks show 0
+    block_counts = blocks.groupby(['set_number', 'outcome'], sort=False, observed=True).size().unstack('outcome', fill_value=0)
+    block_counts.columns = block_counts.columns.astype(str)
+    block_counts = block_counts.reindex(index=player_sets, columns=[o for o, _, _ in BLOCK_OUTCOME_BREAKDOWN],
+                                        fill_value=0)
     
-    # Get block outcomes by set
-    block_details_by_set = {}
-    for set_num in played_sets:
-        set_blocks = blocks[blocks['set_number'] == set_num]
-        block_details_by_set[set_num] = {
-            'kill': len(set_blocks[set_blocks['outcome'] == 'kill']),
-            'block_no_kill': len(set_blocks[set_blocks['outcome'] == 'block_no_kill']),
-            'touch': len(set_blocks[set_blocks['outcome'] == 'touch']),
-            'no_touch': len(set_blocks[set_blocks['outcome'] == 'no_touch']),
-            'error': len(set_blocks[set_blocks['outcome'] == 'error'])
-        }
+    # Calculate total block attempts for sample size
+    total_block_attempts = int(block_counts.to_numpy().sum())
     
     # Check if there's any block data
-    if not any(sum(v.values()) > 0 for v in block_details_by_set.values()):
+    if total_block_attempts == 0:
         st.info("No block data available")
         return
     
     # Create stacked bar chart - same color scheme as team blocking charts
     fig = go.Figure()
-    
-    # Kills (green)
-    fig.add_trace(go.Bar(
-        x=[f"Set {s}" for s in played_sets],
-        y=[block_details_by_set.get(s, {}).get('kill', 0) for s in played_sets],
-        name='Kills',
-        marker_color=OUTCOME_COLORS['kill'],
-        text=[block_details_by_set.get(s, {}).get('kill', 0) for s in played_sets],
-        textposition='inside',
-        textfont=dict(size=9, color='#FFFFFF')
-    ))
-    
-    # Block - No Kill (light green - better than touch)
-    fig.add_trace(go.Bar(
-        x=[f"Set {s}" for s in played_sets],
-        y=[block_details_by_set.get(s, {}).get('block_no_kill', 0) for s in played_sets],
-        name='Block - No Kill',
-        marker_color=OUTCOME_COLORS['good'],
-        text=[block_details_by_set.get(s, {}).get('block_no_kill', 0) for s in played_sets],
-        textposition='inside',
-        textfont=dict(size=9, color='#FFFFFF')
-    ))
-    
-    # Touches (orange)
-    fig.add_trace(go.Bar(
-        x=[f"Set {s}" for s in played_sets],
-        y=[block_details_by_set.get(s, {}).get('touch', 0) for s in played_sets],
-        name='Touches',
-        marker_color=OUTCOME_COLORS.get('block_no_kill', '#FF9800'),
-        text=[block_details_by_set.get(s, {}).get('touch', 0) for s in played_sets],
-        textposition='inside',
-        textfont=dict(size=9, color='#FFFFFF')
-    ))
-    
-    # No Touch (gray)
-    fig.add_trace(go.Bar(
-        x=[f"Set {s}" for s in played_sets],
-        y=[block_details_by_set.get(s, {}).get('no_touch', 0) for s in played_sets],
-        name='No Touch',
-        marker_color=OUTCOME_COLORS.get('no_touch', '#999999'),
-        text=[block_details_by_set.get(s, {}).get('no_touch', 0) for s in played_sets],
-        textposition='inside',
-        textfont=dict(size=9, color='#FFFFFF')
-    ))
-    
-    # Errors (red)
-    fig.add_trace(go.Bar(
-        x=[f"Set {s}" for s in played_sets],
-        y=[block_details_by_set.get(s, {}).get('error', 0) for s in played_sets],
-        name='Errors',
-        marker_color=OUTCOME_COLORS['error'],
-        text=[block_details_by_set.get(s, {}).get('error', 0) for s in played_sets],
-        textposition='inside',
-        textfont=dict(size=9, color='#FFFFFF')
-    ))
-    
-    # Calculate total block attempts for sample size
-    total_block_attempts = sum(sum(block_details_by_set.get(s, {}).values()) for s in played_sets)
+    set_labels = [f"Set {s}" for s in player_sets]
+    for outcome, label, color in BLOCK_OUTCOME_BREAKDOWN:
+        # One array per outcome feeds both the bar heights and their labels
+        counts = block_counts[outcome].to_numpy(dtype=np.int32)
+        fig.add_trace(go.Bar(
+            x=set_labels,
+            y=counts,
+            name=label,
+            marker_color=color,
+            text=counts.astype(str),
+            textposition='inside',
+            textfont=dict(size=9, color='#FFFFFF')
+        ))
     
     fig.update_layout(
         title=f"Block Outcomes by Set (n={total_block_attempts} blocks)",
@@ -324,40 +452,15 @@ def _create_block_breakdown_by_set(player_df: pd.DataFrame, player_name: str) ->
 
 def _create_reception_performance_chart(receives: pd.DataFrame, player_name: str) -> None:
     """Create reception performance donut chart with outcome breakdown."""
-    if len(receives) == 0:
+    if receives.empty:
         return
     
     st.markdown("#### 📥 Reception Performance")
     
-    # Count outcomes
-    perfect = len(receives[receives['outcome'] == 'perfect'])
-    good = len(receives[receives['outcome'] == 'good'])
-    poor = len(receives[receives['outcome'] == 'poor'])
-    errors = len(receives[receives['outcome'] == 'error'])
-    
     total = len(receives)
     
-    # Build labels, values, and colors
-    labels = []
-    values = []
-    colors_list = []
-    
-    if perfect > 0:
-        labels.append('Perfect')
-        values.append(perfect)
-        colors_list.append(OUTCOME_COLORS.get('perfect', '#28A745'))
-    if good > 0:
-        labels.append('Good')
-        values.append(good)
-        colors_list.append(OUTCOME_COLORS.get('good', '#6CBF47'))
-    if poor > 0:
-        labels.append('Poor')
-        values.append(poor)
-        colors_list.append(OUTCOME_COLORS.get('poor', '#FFC107'))
-    if errors > 0:
-        labels.append('Error')
-        values.append(errors)
-        colors_list.append(OUTCOME_COLORS.get('error', '#DC3545'))
+    # Build labels, values, and colors from one count of the outcomes
+    labels, values, colors_list = _outcome_breakdown(receives['outcome'], PASS_OUTCOME_BREAKDOWN)
     
     if not labels:
         st.info("No reception data available")
@@ -396,40 +499,15 @@ def _create_reception_performance_chart(receives: pd.DataFrame, player_name: str
 
 def _create_dig_performance_chart(digs: pd.DataFrame, player_name: str) -> None:
     """Create dig performance donut chart with outcome breakdown."""
-    if len(digs) == 0:
+    if digs.empty:
         return
     
     st.markdown("#### 🛡️ Dig Performance")
     
-    # Count outcomes
-    perfect = len(digs[digs['outcome'] == 'perfect'])
-    good = len(digs[digs['outcome'] == 'good'])
-    poor = len(digs[digs['outcome'] == 'poor'])
-    errors = len(digs[digs['outcome'] == 'error'])
-    
     total = len(digs)
     
-    # Build labels, values, and colors
-    labels = []
-    values = []
-    colors_list = []
-    
-    if perfect > 0:
-        labels.append('Perfect')
-        values.append(perfect)
-        colors_list.append(OUTCOME_COLORS.get('perfect', '#28A745'))
-    if good > 0:
-        labels.append('Good')
-        values.append(good)
-        colors_list.append(OUTCOME_COLORS.get('good', '#6CBF47'))
-    if poor > 0:
-        labels.append('Poor')
-        values.append(poor)
-        colors_list.append(OUTCOME_COLORS.get('poor', '#FFC107'))
-    if errors > 0:
-        labels.append('Error')
-        values.append(errors)
-        colors_list.append(OUTCOME_COLORS.get('error', '#DC3545'))
+    # Build labels, values, and colors from one count of the outcomes
+    labels, values, colors_list = _outcome_breakdown(digs['outcome'], PASS_OUTCOME_BREAKDOWN)
     
     if not labels:
         st.info("No dig data available")
@@ -466,125 +544,139 @@ def _create_dig_performance_chart(digs: pd.DataFrame, player_name: str) -> None:
     st.plotly_chart(fig, use_container_width=True, config=plotly_config, key=f"player_dig_performance_{player_name}")
 
 
-def _create_action_distribution_chart(player_df: pd.DataFrame) -> None:
-    """Create action distribution donut chart with unique colors."""
-    action_counts = player_df['action'].value_counts()
-    if len(action_counts) == 0:
+def _create_distribution_charts(player_df: pd.DataFrame) -> None:
+    """Create the action and outcome distribution donuts side by side in one figure.
+    
+    Both donuts ship to the browser as a single Plotly payload; each keeps its
+    own title, legend and total in the middle.
+    """
+    counts = _distribution_counts(player_df)
+    donuts = [
+        (title, donut) for title, donut in (
+            ("Action Distribution", _action_distribution_pie(counts)),
+            ("Outcome Distribution", _outcome_distribution_pie(counts))
+        )
+        if donut is not None
+    ]
+    if not donuts:
         return
     
-    total_actions = action_counts.sum()
-    action_percentages = (action_counts / total_actions) * 100
-    
-    # Unique color mapping aligned with dashboard palette
-    action_color_map = {
-        'attack': '#F5A623',        # orange
-        'serve': '#00B5AD',         # teal
-        'receive': '#7ED321',       # green
-        'set': '#4A6CF7',           # blue
-        'block': '#9013FE',         # purple
-        'dig': '#BD10E0'            # magenta
+    fig = make_subplots(
+        rows=1, cols=len(donuts),
+        specs=[[{'type': 'domain'}] * len(donuts)],
+        subplot_titles=[title for title, _ in donuts],
+        horizontal_spacing=0.1
+    )
+    fig.update_annotations(font=dict(size=16, color='#050d76', family='Poppins, sans-serif'))
+    fig = apply_beautiful_theme(fig, legend_position='bottom')
+    legend_style = fig.layout.legend.to_plotly_json()
+    
+    # One legend under each donut (legend, legend2) and the total in its hole
+    legends = {}
+    for col, (_, (pie, total)) in enumerate(donuts, start=1):
+        legend_name = 'legend' if col == 1 else f'legend{col}'
+        fig.add_trace(pie.update(legend=legend_name), row=1, col=col)
+        x_center = sum(fig.data[-1].domain.x) / 2
+        legends[legend_name] = {**legend_style, 'x': x_center, 'xanchor': 'center', 'y': -0.05}
+        fig.add_annotation(
+            text=f"Total\n{total}", x=x_center, y=0.5, xref='paper', yref='paper',
+            font=dict(size=14, color='#050d76', family='Inter, sans-serif'),
+            showarrow=False
+        )
+    
+    fig.update_layout(
+        height=CHART_HEIGHTS['large'],
+        margin=dict(l=0, r=0, t=60, b=100),
+        font=dict(family='Inter, sans-serif', size=11, color='#050d76'),
+        **legends
+    )
+    st.plotly_chart(fig, use_container_width=True, config=plotly_config, key="player_distributions")
+
+
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _distribution_counts(player_df: pd.DataFrame) -> Dict[str, Any]:
+    """Count a player's actions and outcome buckets for the distribution donuts, cached across reruns.
+    
+    Args:
+        player_df: Player's rows
+        
+    Returns:
+        Dict with the observed 'actions' and their 'action_counts', plus the
+        'outcome_counts' per OUTCOME_DISTRIBUTION_ORDER bucket (None without outcomes)
+    """
+    action_counts = player_df['action'].value_counts()
+    # Categorical columns report unused categories with a zero count
+    action_counts = action_counts[action_counts > 0]
+    counts = {
+        'actions': action_counts.index.tolist(),
+        'action_counts': action_counts.to_numpy(),
+        'outcome_counts': None
     }
-    colors = [action_color_map.get(action.lower(), '#9B9B9B') for action in action_counts.index]
     
-    fig = go.Figure(data=[go.Pie(
-        labels=action_counts.index.str.title(),
-        values=action_counts.values,
+    if 'outcome' in player_df.columns and not player_df.empty:
+        # Bucket every outcome in one vectorized map (unknown outcomes count as Neutral)
+        outcomes = player_df['outcome'].dropna()
+        buckets = outcomes.str.lower().map(OUTCOME_DISTRIBUTION_BUCKETS).fillna('Neutral')
+        # int32 arrays go to the browser as compact typed arrays instead of JSON lists
+        counts['outcome_counts'] = (
+            buckets.value_counts().reindex(OUTCOME_DISTRIBUTION_ORDER, fill_value=0).to_numpy(dtype=np.int32)
+        )
+    return counts
+
+
+def _action_distribution_pie(counts: Dict[str, Any]) -> Optional[Tuple[go.Pie, int]]:
+    """Build the action distribution donut with unique colors.
+    
+    Returns:
+        Tuple of (Pie trace, total actions), or None if there are no actions
+    """
+    actions = counts['actions']
+    if not actions:
+        return None
+    
+    # At most a handful of actions - plain list comprehensions beat the .str accessor here
+    colors = [ACTION_DISTRIBUTION_COLORS.get(action.lower(), '#9B9B9B') for action in actions]
+    
+    pie = go.Pie(
+        labels=[action.title() for action in actions],
+        values=counts['action_counts'],
         hole=0.4,
         marker=dict(colors=colors, line=dict(color='white', width=2)),
         textinfo='percent',
         textfont=dict(size=14, color='#050d76', family='Inter, sans-serif'),
         hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-    )])
-    fig.update_layout(
-        title="Action Distribution",
-        height=CHART_HEIGHTS['medium'],
-        showlegend=True,
-        legend=dict(orientation="v", yanchor="top", y=1, xanchor="left", x=1.05),
-        margin=dict(l=0, r=100, t=50, b=0),
-        font=dict(family='Inter, sans-serif', size=11, color='#050d76'),
-        annotations=[dict(
-            text=f"Total\n{int(total_actions)}", x=0.5, y=0.5,
-            font=dict(size=14, color='#050d76', family='Inter, sans-serif'),
-            showarrow=False
-        )]
     )
-    fig = apply_beautiful_theme(fig, "Action Distribution")
-    st.plotly_chart(fig, use_container_width=True, config=plotly_config, key="player_action_distribution")
+    return pie, int(counts['action_counts'].sum())
 
 
-def _create_outcome_distribution_chart(player_df: pd.DataFrame) -> None:
-    """Create outcome distribution donut chart grouped into four buckets."""
-    if 'outcome' not in player_df.columns or player_df.empty:
-        return
-    
-    outcome_counts = player_df['outcome'].value_counts()
-    total_outcomes = outcome_counts.sum()
-    
-    category_map = {
-        'kill': 'Kills',
-        'ace': 'Kills',
-        'good': 'Positive',
-        'exceptional': 'Positive',
-        'perfect': 'Positive',
-        'touch': 'Neutral',
-        'defended': 'Neutral',
-        'poor': 'Neutral',
-        'error': 'Errors',
-        'blocked': 'Errors',
-        'out': 'Errors',
-        'net': 'Errors',
-        'no_touch': 'Neutral',
-        'block_no_kill': 'Neutral'
-    }
+def _outcome_distribution_pie(counts: Dict[str, Any]) -> Optional[Tuple[go.Pie, int]]:
+    """Build the outcome distribution donut grouped into four buckets.
     
-    grouped_counts = {'Kills': 0, 'Positive': 0, 'Neutral': 0, 'Errors': 0}
-    for outcome, count in outcome_counts.items():
-        bucket = category_map.get(outcome.lower(), 'Neutral')
-        grouped_counts[bucket] += count
-    
-    categories = ['Kills', 'Positive', 'Neutral', 'Errors']
-    values = [grouped_counts[c] for c in categories]
-    colors = [
-        OUTCOME_COLORS.get('kill', '#4CAF50'),
-        OUTCOME_COLORS.get('good', '#8BC34A'),
-        '#F5A623',
-        OUTCOME_COLORS.get('error', '#FF6B6B')
-    ]
+    Returns:
+        Tuple of (Pie trace, total outcomes), or None if there are no outcomes
+    """
+    values = counts['outcome_counts']
+    if values is None:
+        return None
     
-    fig = go.Figure(data=[go.Pie(
-        labels=categories,
+    pie = go.Pie(
+        labels=OUTCOME_DISTRIBUTION_ORDER,
         values=values,
         hole=0.4,
-        marker=dict(colors=colors, line=dict(color='white', width=2)),
+        marker=dict(colors=OUTCOME_DISTRIBUTION_COLORS, line=dict(color='white', width=2)),
         textinfo='percent',
         textfont=dict(size=14, color='#050d76', family='Inter, sans-serif'),
         hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-    )])
-    fig.update_layout(
-        title="Outcome Distribution",
-        height=CHART_HEIGHTS['medium'],
-        showlegend=True,
-        legend=dict(orientation="v", yanchor="top", y=1, xanchor="left", x=1.05),
-        margin=dict(l=0, r=100, t=50, b=0),
-        font=dict(family='Inter, sans-serif', size=11, color='#050d76'),
-        annotations=[dict(
-            text=f"Total\n{int(total_outcomes)}", x=0.5, y=0.5,
-            font=dict(size=14, color='#050d76', family='Inter, sans-serif'),
-            showarrow=False
-        )]
     )
-    fig = apply_beautiful_theme(fig, "Outcome Distribution")
-    st.plotly_chart(fig, use_container_width=True, config=plotly_config, key="player_outcome_distribution")
+    return pie, int(values.sum())
 
 
-def _create_attacker_specific_charts(player_df: pd.DataFrame, analyzer: MatchAnalyzer, 
+def _create_attacker_specific_charts(attacks: pd.DataFrame, analyzer: MatchAnalyzer, 
                                     player_name: str, loader=None) -> None:
     """Create attacker-specific charts (Attack Type Distribution, Attack Type Efficiency)."""
     st.markdown("#### 🏐 Attacking Performance")
     
-    attacks = player_df[player_df['action'] == 'attack']
-    
-    if len(attacks) == 0:
+    if attacks.empty:
         st.info("No attack data available")
         return
     
@@ -595,8 +687,9 @@ def _create_attacker_specific_charts(player_df: pd.DataFrame, analyzer: MatchAna
         # Attack Type Distribution
         if 'attack_type' in attacks.columns:
             attack_types = attacks['attack_type'].value_counts()
+            # Categorical columns report unused categories with a zero count
+            attack_types = attack_types[attack_types > 0]
             if len(attack_types) > 0:
-                from config import ATTACK_TYPE_COLORS
                 type_colors = {
                     'normal': ATTACK_TYPE_COLORS.get('normal', '#4A90E2'),
                     'tip': ATTACK_TYPE_COLORS.get('tip', '#F5A623'),
@@ -627,24 +720,20 @@ def _create_attacker_specific_charts(player_df: pd.DataFrame, analyzer: MatchAna
     with col2:
         # Attack Type Efficiency
         if 'attack_type' in attacks.columns:
-            from config import ATTACK_TYPE_COLORS
-            type_efficiency = {}
-            type_attempts = {}
-            
-            for attack_type in attacks['attack_type'].unique():
-                type_attacks = attacks[attacks['attack_type'] == attack_type]
-                if len(type_attacks) > 0:
-                    kills = len(type_attacks[type_attacks['outcome'] == 'kill'])
-                    errors = len(type_attacks[type_attacks['outcome'].isin(['blocked', 'out', 'net'])])  # error removed
-                    attempts = len(type_attacks)
-                    efficiency = ((kills - errors) / attempts * 100) if attempts > 0 else 0
-                    type_efficiency[attack_type] = efficiency
-                    type_attempts[attack_type] = attempts
+            # Tally kills, errors and attempts for every attack type in one groupby
+            type_stats = pd.DataFrame({
+                'kills': _isin_mask(attacks['outcome'], ('kill',)),
+                'errors': _isin_mask(attacks['outcome'], ATTACK_ERROR_OUTCOMES)  # error removed
+            }).groupby(attacks['attack_type'].to_numpy(), sort=False).agg(
+                kills=('kills', 'sum'), errors=('errors', 'sum'), attempts=('kills', 'size')
+            )
+            type_stats['efficiency'] = (type_stats['kills'] - type_stats['errors']) / type_stats['attempts'] * 100
             
-            if type_efficiency:
-                attack_types_list = list(type_efficiency.keys())
-                efficiency_values = [type_efficiency[t] for t in attack_types_list]
-                attempts_values = [type_attempts[t] for t in attack_types_list]
+            if not type_stats.empty:
+                # Plot straight from the small per-type table
+                attack_types_list = type_stats.index.tolist()
+                efficiency_values = type_stats['efficiency'].tolist()
+                attempts_values = type_stats['attempts'].tolist()
                 colors_list = [ATTACK_TYPE_COLORS.get(t.lower(), '#999999') for t in attack_types_list]
                 
                 fig = go.Figure(data=[go.Bar(
@@ -669,14 +758,12 @@ def _create_attacker_specific_charts(player_df: pd.DataFrame, analyzer: MatchAna
                 st.plotly_chart(fig, use_container_width=True, config=plotly_config, key="player_attack_type_efficiency")
 
 
-def _create_setter_specific_charts(player_df: pd.DataFrame, analyzer: MatchAnalyzer,
+def _create_setter_specific_charts(player_sets: np.ndarray, sets: pd.DataFrame, analyzer: MatchAnalyzer,
                                   player_name: str, loader=None) -> None:
     """Create setter-specific charts (Setting Quality by Set, Set Distribution)."""
     st.markdown("#### 🎯 Setting Performance")
     
-    sets = player_df[player_df['action'] == 'set']
-    
-    if len(sets) == 0:
+    if sets.empty:
         st.info("No setting data available")
         return
     
@@ -684,21 +771,11 @@ def _create_setter_specific_charts(player_df: pd.DataFrame, analyzer: MatchAnaly
     
     with col1:
         # Setting Quality by Set
-        played_sets = sorted(player_df['set_number'].unique())
-        quality_by_set = []
-        
-        for set_num in played_sets:
-            set_sets = sets[sets['set_number'] == set_num]
-            good_sets = len(set_sets[set_sets['outcome'].isin(['exceptional', 'good'])])
-            total_sets = len(set_sets)
-            
-            if total_sets > 0:
-                quality_by_set.append((good_sets / total_sets) * 100)
-            else:
-                quality_by_set.append(0)
+        good_sets = pd.Series(_isin_mask(sets['outcome'], GOOD_SET_OUTCOMES), index=sets.index)
+        quality_by_set = _pct_by_set(good_sets, sets['set_number'], player_sets)
         
         fig = go.Figure(data=go.Scatter(
-            x=[f"Set {s}" for s in played_sets],
+            x=[f"Set {s}" for s in player_sets],
             y=quality_by_set,
             mode='lines+markers',
             name='Setting Quality',
@@ -720,31 +797,7 @@ def _create_setter_specific_charts(player_df: pd.DataFrame, analyzer: MatchAnaly
     
     with col2:
         # Setting Outcome Distribution
-        exceptional = len(sets[sets['outcome'] == 'exceptional'])
-        good = len(sets[sets['outcome'] == 'good'])
-        poor = len(sets[sets['outcome'] == 'poor'])
-        errors = len(sets[sets['outcome'] == 'error'])
-        
-        labels = []
-        values = []
-        colors_list = []
-        
-        if exceptional > 0:
-            labels.append('Exceptional')
-            values.append(exceptional)
-            colors_list.append(OUTCOME_COLORS['perfect'])
-        if good > 0:
-            labels.append('Good')
-            values.append(good)
-            colors_list.append(OUTCOME_COLORS['good'])
-        if poor > 0:
-            labels.append('Poor')
-            values.append(poor)
-            colors_list.append(OUTCOME_COLORS['poor'])
-        if errors > 0:
-            labels.append('Error')
-            values.append(errors)
-            colors_list.append(OUTCOME_COLORS['error'])
+        labels, values, colors_list = _outcome_breakdown(sets['outcome'], SETTING_OUTCOME_BREAKDOWN)
         
         if labels:
             fig = go.Figure(data=[go.Pie(
@@ -768,36 +821,24 @@ def _create_setter_specific_charts(player_df: pd.DataFrame, analyzer: MatchAnaly
             st.plotly_chart(fig, use_container_width=True, config=plotly_config, key="player_setting_outcomes")
 
 
-def _create_libero_specific_charts(player_df: pd.DataFrame, analyzer: MatchAnalyzer,
-                                  player_name: str, loader=None) -> None:
+def _create_libero_specific_charts(player_sets: np.ndarray, receives: pd.DataFrame, digs: pd.DataFrame,
+                                  analyzer: MatchAnalyzer, player_name: str, loader=None) -> None:
     """Create libero-specific charts (Reception Quality by Set, Dig Success Rate)."""
-    st.markdown("#### 📥 Reception & Defense Performance")
+    if len(player_sets) == 0:
+        return
     
-    receives = player_df[player_df['action'] == 'receive']
-    digs = player_df[player_df['action'] == 'dig']
+    st.markdown("#### 📥 Reception & Defense Performance")
     
     col1, col2 = st.columns(2)
     
     with col1:
         # Reception Quality by Set
-        if len(receives) > 0:
-            played_sets = sorted(player_df['set_number'].unique())
-            quality_by_set = []
-            
-            from utils.helpers import filter_good_receptions
-            
-            for set_num in played_sets:
-                set_receives = receives[receives['set_number'] == set_num]
-                good_receives = len(filter_good_receptions(set_receives))
-                total_receives = len(set_receives)
-                
-                if total_receives > 0:
-                    quality_by_set.append((good_receives / total_receives) * 100)
-                else:
-                    quality_by_set.append(0)
+        if not receives.empty:
+            # receives only holds receptions, so a good reception is just a good pass outcome
+            quality_by_set = _pct_by_set(receives['outcome'].isin(GOOD_PASS_OUTCOMES), receives['set_number'], player_sets)
             
             fig = go.Figure(data=go.Scatter(
-                x=[f"Set {s}" for s in played_sets],
+                x=[f"Set {s}" for s in player_sets],
                 y=quality_by_set,
                 mode='lines+markers',
                 name='Reception Quality',
@@ -821,24 +862,11 @@ def _create_libero_specific_charts(player_df: pd.DataFrame, analyzer: MatchAnaly
     
     with col2:
         # Dig Success Rate by Set
-        if len(digs) > 0:
-            played_sets = sorted(player_df['set_number'].unique())
-            success_by_set = []
-            
-            from utils.helpers import filter_good_digs
-            
-            for set_num in played_sets:
-                set_digs = digs[digs['set_number'] == set_num]
-                good_digs = len(filter_good_digs(set_digs))
-                total_digs = len(set_digs)
-                
-                if total_digs > 0:
-                    success_by_set.append((good_digs / total_digs) * 100)
-                else:
-                    success_by_set.append(0)
+        if not digs.empty:
+            success_by_set = _pct_by_set(digs['outcome'].isin(GOOD_PASS_OUTCOMES), digs['set_number'], player_sets)
             
             fig = go.Figure(data=go.Scatter(
-                x=[f"Set {s}" for s in played_sets],
+                x=[f"Set {s}" for s in player_sets],
                 y=success_by_set,
                 mode='lines+markers',
                 name='Dig Success Rate',
@@ -861,25 +889,33 @@ def _create_libero_specific_charts(player_df: pd.DataFrame, analyzer: MatchAnaly
             st.info("No dig data available")
 
 
-def _create_performance_by_set_charts(player_df: pd.DataFrame, analyzer: MatchAnalyzer,
-                                     player_name: str, loader=None) -> None:
+def _create_performance_by_set_charts(player_df: pd.DataFrame, by_action: Dict[str, pd.DataFrame],
+                                     analyzer: MatchAnalyzer, player_name: str,
+                                     position_class: Optional[str], played_sets: tuple,
+                                     player_sets: np.ndarray) -> None:
     """Create enhanced performance by set charts with quality metrics and team comparison."""
-    from utils.helpers import get_player_position
+    if player_df.empty:
+        return
+    
     df = analyzer.match_data
-    position = get_player_position(df, player_name)
+    
+    # Slice the all-player set x outcome counts instead of regrouping player_df
+    set_outcome_counts = _player_set_outcome_counts(df, player_name, played_sets)
     
     # Player actions by set (workload)
-    set_actions = player_df.groupby('set_number')['action'].count()
-    all_sets = sorted(player_df['set_number'].unique())
+    set_actions = set_outcome_counts.sum(axis=1)
+    set_labels = [f"Set {s}" for s in player_sets]
+    # int32 arrays go to the browser as compact typed arrays instead of JSON lists
+    set_action_counts = set_actions.reindex(player_sets, fill_value=0).to_numpy(dtype=np.int32)
     
     col1, col2 = st.columns(2)
     
     with col1:
         fig_set = go.Figure(data=go.Bar(
-            x=[f"Set {s}" for s in all_sets],
-            y=[set_actions.get(s, 0) for s in all_sets],
+            x=set_labels,
+            y=set_action_counts,
             marker_color=OUTCOME_COLORS['serving_rate'],
-            text=[set_actions.get(s, 0) for s in all_sets],
+            text=set_action_counts.astype(str),
             textposition='outside',
             textfont=dict(size=11, color='#050d76')
         ))
@@ -901,30 +937,17 @@ def _create_performance_by_set_charts(player_df: pd.DataFrame, analyzer: MatchAn
     
     with col2:
         # Position-specific performance metric by set
-        if position and (position.startswith('OH') or position == 'OPP' or position.startswith('MB')):
+        if position_class == 'attacker':
             # Attack Kill % by Set
-            attacks = player_df[player_df['action'] == 'attack']
-            kill_pct_by_set = []
-            team_kill_pct_by_set = []
+            attacks = by_action.get('attack', player_df.iloc[:0])
             
-            for set_num in all_sets:
-                set_attacks = attacks[attacks['set_number'] == set_num]
-                kills = len(set_attacks[set_attacks['outcome'] == 'kill'])
-                attempts = len(set_attacks)
-                kill_pct = (kills / attempts * 100) if attempts > 0 else 0
-                kill_pct_by_set.append(kill_pct)
-                
-                # Team average
-                set_df = df[df['set_number'] == set_num]
-                team_attacks = set_df[set_df['action'] == 'attack']
-                team_kills = len(team_attacks[team_attacks['outcome'] == 'kill'])
-                team_attempts = len(team_attacks)
-                team_kill_pct = (team_kills / team_attempts * 100) if team_attempts > 0 else 0
-                team_kill_pct_by_set.append(team_kill_pct)
+            # One groupby for the player and the cached match counts for the team; sets without attacks show 0
+            kill_pct_by_set = _pct_by_set(attacks['outcome'] == 'kill', attacks['set_number'], player_sets)
+            team_kill_pct_by_set = _count_pct_by_set(outcome_counts_by_set(df, 'attack'), ('kill',), player_sets)
             
             fig = go.Figure()
             fig.add_trace(go.Scatter(
-                x=[f"Set {s}" for s in all_sets],
+                x=set_labels,
                 y=kill_pct_by_set,
                 mode='lines+markers',
                 name='Player',
@@ -932,7 +955,7 @@ def _create_performance_by_set_charts(player_df: pd.DataFrame, analyzer: MatchAn
                 marker=dict(size=10)
             ))
             fig.add_trace(go.Scatter(
-                x=[f"Set {s}" for s in all_sets],
+                x=set_labels,
                 y=team_kill_pct_by_set,
                 mode='lines+markers',
                 name='Team Average',
@@ -951,32 +974,19 @@ def _create_performance_by_set_charts(player_df: pd.DataFrame, analyzer: MatchAn
             fig = apply_beautiful_theme(fig, "Attack Kill % by Set")
             st.plotly_chart(fig, use_container_width=True, config=plotly_config, key="player_kill_pct_by_set")
         
-        elif position == 'L':
+        elif position_class == 'libero':
             # Reception Quality by Set (already shown in libero-specific, but show here too for consistency)
-            receives = player_df[player_df['action'] == 'receive']
-            from utils.helpers import filter_good_receptions
+            receives = by_action.get('receive', player_df.iloc[:0])
             
-            rec_quality_by_set = []
-            team_rec_quality_by_set = []
-            
-            for set_num in all_sets:
-                set_receives = receives[receives['set_number'] == set_num]
-                good_receives = len(filter_good_receptions(set_receives))
-                attempts = len(set_receives)
-                quality = (good_receives / attempts * 100) if attempts > 0 else 0
-                rec_quality_by_set.append(quality)
-                
-                # Team average
-                set_df = df[df['set_number'] == set_num]
-                team_receives = set_df[set_df['action'] == 'receive']
-                team_good = len(filter_good_receptions(team_receives))
-                team_attempts = len(team_receives)
-                team_quality = (team_good / team_attempts * 100) if team_attempts > 0 else 0
-                team_rec_quality_by_set.append(team_quality)
+            # Only receptions are counted, so a good reception is just a good pass outcome
+            rec_quality_by_set = _pct_by_set(receives['outcome'].isin(GOOD_PASS_OUTCOMES), receives['set_number'],
+                                             player_sets)
+            team_rec_quality_by_set = _count_pct_by_set(outcome_counts_by_set(df, 'receive'), GOOD_PASS_OUTCOMES,
+                                                        player_sets)
             
             fig = go.Figure()
             fig.add_trace(go.Scatter(
-                x=[f"Set {s}" for s in all_sets],
+                x=set_labels,
                 y=rec_quality_by_set,
                 mode='lines+markers',
                 name='Player',
@@ -984,7 +994,7 @@ def _create_performance_by_set_charts(player_df: pd.DataFrame, analyzer: MatchAn
                 marker=dict(size=10)
             ))
             fig.add_trace(go.Scatter(
-                x=[f"Set {s}" for s in all_sets],
+                x=set_labels,
                 y=team_rec_quality_by_set,
                 mode='lines+markers',
                 name='Team Average',
@@ -1005,49 +1015,35 @@ def _create_performance_by_set_charts(player_df: pd.DataFrame, analyzer: MatchAn
         
         else:
             # Generic: Outcomes by Set
-            set_kills = player_df[player_df['outcome'] == 'kill'].groupby('set_number').size()
-            set_aces = player_df[player_df['outcome'] == 'ace'].groupby('set_number').size()
-            set_good = player_df[
-                (player_df['outcome'] == 'good') | 
-                (player_df['outcome'] == 'defended') | 
-                (player_df['outcome'].isin(['perfect', 'good'])) |
-                (player_df['outcome'] == 'touch')
-            ].groupby('set_number').size()
-            set_errors = player_df[player_df['outcome'] == 'error'].groupby('set_number').size()
-            
-            set_kills_reindexed = set_kills.reindex(all_sets, fill_value=0) if len(set_kills) > 0 else pd.Series(0, index=all_sets)
-            set_aces_reindexed = set_aces.reindex(all_sets, fill_value=0) if len(set_aces) > 0 else pd.Series(0, index=all_sets)
-            set_kills_combined = set_kills_reindexed + set_aces_reindexed
-            set_good_reindexed = set_good.reindex(all_sets, fill_value=0) if len(set_good) > 0 else pd.Series(0, index=all_sets)
-            set_errors_reindexed = set_errors.reindex(all_sets, fill_value=0) if len(set_errors) > 0 else pd.Series(0, index=all_sets)
+            # One set x outcome count table instead of a mask + groupby per outcome
+            outcome_counts = set_outcome_counts.reindex(index=player_sets, columns=SET_OUTCOME_COLUMNS, fill_value=0)
             
-            fig_outcomes = go.Figure()
+            set_kills_combined = outcome_counts['kill'] + outcome_counts['ace']
+            set_good_reindexed = outcome_counts[SET_GOOD_OUTCOMES].sum(axis=1)
+            set_errors_reindexed = outcome_counts['error']
             
-            if set_kills_combined.sum() > 0:
-                fig_outcomes.add_trace(go.Bar(
-                    x=[f"Set {s}" for s in all_sets],
-                    y=[set_kills_combined.get(s, 0) for s in all_sets],
-                    name='Kills',
-                    marker_color=OUTCOME_COLORS['kill']
-                ))
+            # Sum each series once; nothing to plot if all of them are empty
+            outcome_series = [
+                ('Kills', set_kills_combined, int(set_kills_combined.sum()), OUTCOME_COLORS['kill']),
+                ('Good', set_good_reindexed, int(set_good_reindexed.sum()), OUTCOME_COLORS['good']),
+                ('Errors', set_errors_reindexed, int(set_errors_reindexed.sum()), OUTCOME_COLORS['error']),
+            ]
+            if not any(total for _, _, total, _ in outcome_series):
+                return
             
-            if set_good_reindexed.sum() > 0:
-                fig_outcomes.add_trace(go.Bar(
-                    x=[f"Set {s}" for s in all_sets],
-                    y=[set_good_reindexed.get(s, 0) for s in all_sets],
-                    name='Good',
-                    marker_color=OUTCOME_COLORS['good']
-                ))
-            
-            if set_errors_reindexed.sum() > 0:
-                fig_outcomes.add_trace(go.Bar(
-                    x=[f"Set {s}" for s in all_sets],
-                    y=[set_errors_reindexed.get(s, 0) for s in all_sets],
-                    name='Errors',
-                    marker_color=OUTCOME_COLORS['error']
-                ))
+            # Assemble the non-empty series first and build the figure in one constructor call
+            traces = [
+                go.Bar(
+                    x=set_labels,
+                    y=series.to_numpy(dtype=np.int32),
+                    name=name,
+                    marker=dict(color=color, line=dict(color='rgba(255,255,255,0.8)', width=1))
+                )
+                for name, series, total, color in outcome_series
+                if total > 0
+            ]
             
-            fig_outcomes.update_layout(
+            fig_outcomes = go.Figure(data=traces, layout=dict(
                 title="Outcomes by Set",
                 xaxis_title="Set Number",
                 yaxis_title="Count",
@@ -1055,10 +1051,7 @@ def _create_performance_by_set_charts(player_df: pd.DataFrame, analyzer: MatchAn
                 height=CHART_HEIGHTS['medium'],
                 xaxis=dict(dtick=1, tickfont=dict(color='#050d76')),
                 yaxis=dict(tickfont=dict(color='#050d76'))
-            )
-            fig_outcomes.update_traces(
-                marker=dict(line=dict(color='rgba(255,255,255,0.8)', width=1))
-            )
+            ))
             fig_outcomes = apply_beautiful_theme(fig_outcomes, "Outcomes by Set")
             st.plotly_chart(fig_outcomes, use_container_width=True, config=plotly_config, key="player_outcomes_by_set")
 
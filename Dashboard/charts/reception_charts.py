@@ -5,23 +5,31 @@ Provides charts for reception analysis including:
 - Reception Quality Distribution by Set
 - Reception by Rotation
 """
-from typing import List, Optional
+from typing import Dict, Optional
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from config import OUTCOME_COLORS, CHART_HEIGHTS
-from charts.utils import apply_beautiful_theme, plotly_config
+from config import OUTCOME_COLORS
+from charts.utils import apply_beautiful_theme, plotly_config, frame_fingerprint, outcome_counts_by_set, fill_donut
+from charts.team_charts import get_played_sets
 
-
-def get_played_sets(df: pd.DataFrame, loader=None) -> List[int]:
-    """Get list of sets that were actually played."""
-    from charts.team_charts import get_played_sets as _get_played_sets
-    return _get_played_sets(df, loader)
+# Fixed order for consistent legend: Perfect, Good, Poor, Error
+RECEPTION_ORDER = ['Perfect', 'Good', 'Poor', 'Error']
+RECEPTION_COLOR_MAP = {
+    'Perfect': OUTCOME_COLORS.get('perfect', '#28A745'),
+    'Good': OUTCOME_COLORS['good'],
+    'Poor': OUTCOME_COLORS.get('poor', '#FFC107'),
+    'Error': OUTCOME_COLORS['error']
+}
 
 
+@st.fragment
 def create_reception_performance_charts(df: pd.DataFrame, loader=None) -> None:
     """Create all reception performance charts.
     
+    Runs as a fragment so changing the set selector only reruns this section
+    instead of the whole page.
+    
     Includes:
     - Reception Quality Distribution by Set (donut charts)
     
@@ -32,92 +40,106 @@ def create_reception_performance_charts(df: pd.DataFrame, loader=None) -> None:
     st.markdown("#### Reception Quality by Set")
     played_sets = get_played_sets(df, loader)
     
-    # Fixed order for consistent legend: Perfect, Good, Poor, Error
-    reception_order = ['Perfect', 'Good', 'Poor', 'Error']
-    reception_color_map = {
-        'Perfect': OUTCOME_COLORS.get('perfect', '#28A745'),
-        'Good': OUTCOME_COLORS['good'],
-        'Poor': OUTCOME_COLORS.get('poor', '#FFC107'),
-        'Error': OUTCOME_COLORS['error']
-    }
-    
     # Create set selector
     set_options = ['All Sets'] + [f'Set {s}' for s in played_sets]
     selected_set = st.selectbox("Select Set", set_options, key="reception_set_selector")
     
     # Determine which data to show
     if selected_set == 'All Sets':
-        filtered_df = df
+        set_num = None
         title = "All Sets"
         key_suffix = "all"
     else:
         set_num = int(selected_set.split()[-1])
-        filtered_df = df[df['set_number'] == set_num]
         title = f"Set {set_num}"
         key_suffix = f"set_{set_num}"
     
-    # Calculate reception data - separate all categories
-    receptions = filtered_df[filtered_df['action'] == 'receive']
-    perfect = len(receptions[receptions['outcome'] == 'perfect'])
-    good = len(receptions[receptions['outcome'] == 'good'])
-    poor = len(receptions[receptions['outcome'] == 'poor'])
-    error = len(receptions[receptions['outcome'].isin(['error', 'ace'])])
-    total = perfect + good + poor + error
-    
-    # Display the chart
-    if total > 0:
-        _create_reception_donut_chart(
-            {'Perfect': perfect, 'Good': good, 'Poor': poor, 'Error': error},
-            reception_order, reception_color_map, title, total, 
-            f"reception_donut_{key_suffix}"
-        )
-    else:
-        st.info("No reception data available")
+    # Display the chart; changing the selected set is a lookup in the cached results
+    reception_results = _reception_results_by_set(df)
+    _create_reception_donut_chart(
+        reception_results.get(set_num, dict.fromkeys(RECEPTION_ORDER, 0)),
+        title, f"reception_donut_{key_suffix}"
+    )
+
+
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _reception_results_by_set(df: pd.DataFrame) -> Dict[Optional[int], Dict[str, int]]:
+    """Bucket reception qualities for every set and for the whole match, cached across reruns.
+    
+    Args:
+        df: Match dataframe
+        
+    Returns:
+        Dict of set number (None for all sets) to reception quality counts
+    """
+    receive_counts = outcome_counts_by_set(df, 'receive')
+    results = {set_num: reception_quality_counts(counts) for set_num, counts in receive_counts.iterrows()}
+    results[None] = reception_quality_counts(receive_counts.sum())
+    return results
+
+
+def reception_quality_counts(counts: pd.Series) -> Dict[str, int]:
+    """Bucket reception outcome counts into the donut qualities.
+    
+    Aces conceded are counted as reception errors.
+    
+    Args:
+        counts: Reception counts by outcome (see action_outcome_counts)
+        
+    Returns:
+        Dict of reception quality ('Perfect', 'Good', 'Poor', 'Error') to count
+    """
+    return {
+        'Perfect': int(counts.get('perfect', 0)),
+        'Good': int(counts.get('good', 0)),
+        'Poor': int(counts.get('poor', 0)),
+        'Error': int(counts.get('error', 0) + counts.get('ace', 0))
+    }
 
 
-def _create_reception_donut_chart(reception_data: dict, reception_order: list, 
-                                   color_map: dict, title: str, total: int, key: str) -> None:
+def _create_reception_donut_chart(reception_data: Dict[str, int], title: str, key: str) -> None:
     """Create a single reception donut chart.
     
     Args:
         reception_data: Dict with reception counts by quality
-        reception_order: Order of reception qualities for legend
-        color_map: Color mapping for reception qualities
         title: Chart title
-        total: Total number of receptions
         key: Unique Streamlit key
     """
-    if total == 0:
+    # Only non-empty slices are drawn; no slices means there is nothing to chart
+    labels = [rec_type for rec_type in RECEPTION_ORDER if reception_data[rec_type] > 0]
+    if not labels:
         st.info("No reception data available")
         return
     
-    labels = []
-    values = []
-    colors = []
-    
-    for rec_type in reception_order:
-        count = reception_data.get(rec_type, 0)
-        if count > 0:
-            labels.append(rec_type)
-            values.append(count)
-            colors.append(color_map[rec_type])
+    figure = fill_donut(_reception_donut_template(), labels,
+                        [reception_data[rec_type] for rec_type in labels],
+                        [RECEPTION_COLOR_MAP[rec_type] for rec_type in labels])
+    figure['layout']['title']['text'] = f"{title} Reception Quality"
+    st.plotly_chart(figure, use_container_width=True, config=plotly_config, key=key)
+
+
+@st.cache_data(show_spinner=False)
+def _reception_donut_template() -> dict:
+    """Build the styled (empty) reception donut as a plotly JSON dict.
     
-    if not labels:
-        st.info("No reception data available")
-        return
+    Only the slices and the title text change between sets, so the figure is
+    built and themed once and ``fill_donut`` patches the dict directly.
+    ``st.cache_data`` hands out a fresh copy on every call.
     
+    Returns:
+        Plotly figure dict with one empty Pie trace
+    """
     fig = go.Figure(data=[go.Pie(
-        labels=labels,
-        values=values,
+        labels=[],
+        values=[],
         hole=0.4,
-        marker=dict(colors=colors, line=dict(color='white', width=2)),
+        marker=dict(line=dict(color='white', width=2)),
         textinfo='percent+label',
         textfont=dict(size=16, color='#050d76', family='Inter, sans-serif'),
         hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
     )])
     
     fig.update_layout(
-        title=dict(text=f"{title} (n={total})", font=dict(size=18)),
         height=400,
         showlegend=True,
         legend=dict(
@@ -132,6 +154,6 @@ def _create_reception_donut_chart(reception_data: dict, reception_order: list,
         font=dict(family='Inter, sans-serif', size=14, color='#050d76')
     )
     
-    fig = apply_beautiful_theme(fig, f"{title} Reception Quality")
-    st.plotly_chart(fig, use_container_width=True, config=plotly_config, key=key)
-
+    fig = apply_beautiful_theme(fig, "Reception Quality")
+    
+    return fig.to_plotly_json()
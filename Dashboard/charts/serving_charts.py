@@ -6,23 +6,30 @@ Provides charts for serve analysis including:
 - Ace Rate distribution
 - Serve error analysis
 """
-from typing import List, Optional
+from typing import Dict, Optional
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from config import OUTCOME_COLORS, CHART_HEIGHTS
-from charts.utils import apply_beautiful_theme, plotly_config
+from config import OUTCOME_COLORS
+from charts.utils import apply_beautiful_theme, plotly_config, frame_fingerprint, outcome_counts_by_set, fill_donut
+from charts.team_charts import get_played_sets
 
-
-def get_played_sets(df: pd.DataFrame, loader=None) -> List[int]:
-    """Get list of sets that were actually played."""
-    from charts.team_charts import get_played_sets as _get_played_sets
-    return _get_played_sets(df, loader)
+# Fixed order for consistent legend: Aces, Good, Errors
+SERVE_ORDER = ['Aces', 'Good', 'Errors']
+SERVE_COLOR_MAP = {
+    'Aces': OUTCOME_COLORS['ace'],
+    'Good': OUTCOME_COLORS['good'],
+    'Errors': OUTCOME_COLORS['error']
+}
 
 
+@st.fragment
 def create_serving_performance_charts(df: pd.DataFrame, loader=None) -> None:
     """Create all serving performance charts.
     
+    Runs as a fragment so changing the set selector only reruns this section
+    instead of the whole page.
+    
     Includes:
     - Serve Performance by Set (4 donut charts: All Sets + one per set)
     
@@ -33,90 +40,107 @@ def create_serving_performance_charts(df: pd.DataFrame, loader=None) -> None:
     st.markdown("#### Serve Performance by Set")
     played_sets = get_played_sets(df, loader)
     
-    # Fixed order for consistent legend: Aces, Good, Errors
-    serve_order = ['Aces', 'Good', 'Errors']
-    serve_color_map = {
-        'Aces': OUTCOME_COLORS['ace'],
-        'Good': OUTCOME_COLORS['good'],
-        'Errors': OUTCOME_COLORS['error']
-    }
-    
     # Create set selector
     set_options = ['All Sets'] + [f'Set {s}' for s in played_sets]
     selected_set = st.selectbox("Select Set", set_options, key="serving_set_selector")
     
     # Determine which data to show
     if selected_set == 'All Sets':
-        filtered_df = df
+        set_num = None
         title = "All Sets"
         key_suffix = "all"
     else:
         set_num = int(selected_set.split()[-1])
-        filtered_df = df[df['set_number'] == set_num]
         title = f"Set {set_num}"
         key_suffix = f"set_{set_num}"
     
-    # Calculate serving data
-    serves = filtered_df[filtered_df['action'] == 'serve']
-    aces = len(serves[serves['outcome'] == 'ace'])
-    good = len(serves[serves['outcome'] == 'good'])
-    errors = len(serves[serves['outcome'] == 'error'])
-    total = aces + good + errors
+    # Display the chart; changing the selected set is a lookup in the cached results
+    serve_results = _serve_results_by_set(df)
+    _create_serve_donut_chart(
+        serve_results.get(set_num, dict.fromkeys(SERVE_ORDER, 0)),
+        title, f"serve_donut_{key_suffix}"
+    )
+
+
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _serve_results_by_set(df: pd.DataFrame) -> Dict[Optional[int], Dict[str, int]]:
+    """Bucket serve results for every set and for the whole match, cached across reruns.
     
-    # Display the chart
-    if total > 0:
-        _create_serve_donut_chart(
-            {'Aces': aces, 'Good': good, 'Errors': errors},
-            serve_order, serve_color_map, title, total, 
-            f"serve_donut_{key_suffix}"
-        )
-    else:
-        st.info("No serve data available")
+    Args:
+        df: Match dataframe
+        
+    Returns:
+        Dict of set number (None for all sets) to serve result counts
+    """
+    serve_counts = outcome_counts_by_set(df, 'serve')
+    results = {set_num: serve_result_counts(counts) for set_num, counts in serve_counts.iterrows()}
+    results[None] = serve_result_counts(serve_counts.sum())
+    return results
 
 
-def _create_serve_donut_chart(serve_data: dict, serve_order: list, 
-                               color_map: dict, title: str, total: int, key: str) -> None:
+def serve_result_counts(counts: pd.Series) -> Dict[str, int]:
+    """Bucket serve outcome counts into the donut results.
+    
+    Args:
+        counts: Serve counts by outcome (see action_outcome_counts)
+        
+    Returns:
+        Dict of serve result ('Aces', 'Good', 'Errors') to count
+    """
+    return {
+        'Aces': int(counts.get('ace', 0)),
+        'Good': int(counts.get('good', 0)),
+        'Errors': int(counts.get('error', 0))
+    }
+
+
+def _create_serve_donut_chart(serve_data: Dict[str, int], title: str, key: str) -> None:
     """Create a single serve donut chart.
     
     Args:
         serve_data: Dict with serve counts by type
-        serve_order: Order of serve types for legend
-        color_map: Color mapping for serve types
         title: Chart title
-        total: Total number of serves
         key: Unique Streamlit key
     """
-    if total == 0:
+    # Only non-empty slices are drawn; no slices means there is nothing to chart
+    labels = [serve_type for serve_type in SERVE_ORDER if serve_data[serve_type] > 0]
+    if not labels:
         st.info("No serve data available")
         return
+    # A single slice is a full ring that says nothing a number doesn't; skip Plotly
+    if len(labels) == 1:
+        st.metric(f"{title} Serve Performance: {labels[0]}", serve_data[labels[0]])
+        return
     
-    labels = []
-    values = []
-    colors = []
-    
-    for serve_type in serve_order:
-        count = serve_data.get(serve_type, 0)
-        if count > 0:
-            labels.append(serve_type)
-            values.append(count)
-            colors.append(color_map[serve_type])
+    figure = fill_donut(_serve_donut_template(), labels,
+                        [serve_data[serve_type] for serve_type in labels],
+                        [SERVE_COLOR_MAP[serve_type] for serve_type in labels])
+    figure['layout']['title']['text'] = f"{title} Serve Performance"
+    st.plotly_chart(figure, use_container_width=False, config=plotly_config, key=key)
+
+
+@st.cache_data(show_spinner=False)
+def _serve_donut_template() -> dict:
+    """Build the styled (empty) serve donut as a plotly JSON dict.
     
-    if not labels:
-        st.info("No serve data available")
-        return
+    Only the slices and the title text change between sets, so the figure is
+    built and themed once and ``fill_donut`` patches the dict directly.
+    ``st.cache_data`` hands out a fresh copy on every call.
     
+    Returns:
+        Plotly figure dict with one empty Pie trace
+    """
     fig = go.Figure(data=[go.Pie(
-        labels=labels,
-        values=values,
+        labels=[],
+        values=[],
         hole=0.4,
-        marker=dict(colors=colors, line=dict(color='white', width=2)),
+        marker=dict(line=dict(color='white', width=2)),
         textinfo='percent+label',
         textfont=dict(size=16, color='#050d76', family='Inter, sans-serif'),
         hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
     )])
     
     fig.update_layout(
-        title=dict(text=f"{title} (n={total})", font=dict(size=18)),
         height=400,
         showlegend=True,
         legend=dict(
@@ -131,6 +155,9 @@ def _create_serve_donut_chart(serve_data: dict, serve_order: list,
         font=dict(family='Inter, sans-serif', size=14, color='#050d76')
     )
     
-    fig = apply_beautiful_theme(fig, f"{title} Serve Performance")
-    st.plotly_chart(fig, use_container_width=True, config=plotly_config, key=key)
-
+    fig = apply_beautiful_theme(fig, "Serve Performance")
+    # Fixed geometry: the donut keeps its size instead of relaying out on every
+    # container resize
+    fig.update_layout(autosize=False, width=500)
+    
+    return fig.to_plotly_json()
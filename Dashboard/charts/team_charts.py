@@ -1,19 +1,35 @@
 """
 Team chart generation module
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, List, Optional
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from match_analyzer import MatchAnalyzer
-from config import OUTCOME_COLORS, CHART_HEIGHTS
+from config import OUTCOME_COLORS, CHART_HEIGHTS, ATTACK_ERROR_OUTCOMES, GOOD_PASS_OUTCOMES
 from config import CHART_COLORS
 from config import ATTACK_TYPE_COLORS
-from charts.utils import apply_beautiful_theme, plotly_config
+from charts.utils import (apply_beautiful_theme, plotly_config, frame_fingerprint, ChartContext, outcome_counts_by_set,
+                          player_position, fill_donut)
 from utils.helpers import filter_good_receptions, filter_good_digs, filter_block_touches
 
+# Soft pastel palette for the action distribution donut
+ACTION_PIE_COLORS = ['#B8E6B8', '#B8D4E6', '#E6D4B8', '#E6B8D4', '#D4B8E6', '#B8E6D4', '#E6E6B8']
+
+# Section 4 serve donut slices in legend order: Aces, Good, Errors
+SERVE_DONUT_LABELS = {'ace': 'Aces', 'good': 'Good', 'error': 'Errors'}
+
+# Outcomes shown first in the outcome bar chart (ace is folded into Kill)
+CORE_OUTCOMES = ['kill', 'ace', 'good', 'error']
+
+# Outcome bar colors: Kill=Green, Good=Yellow/Gold, Error=Red (softened pastels)
+OUTCOME_BAR_COLORS = {
+    'Kill': '#90EE90',  # Soft green
+    'Good': '#FFE4B5',  # Soft yellow/cream
+    'Error': '#FFB6C1'  # Soft pink/red
+}
+
 
 def get_played_sets(df: pd.DataFrame, loader=None) -> List[int]:
     """
@@ -30,16 +46,8 @@ def get_played_sets(df: pd.DataFrame, loader=None) -> List[int]:
     Returns:
         List of set numbers that were actually played
     """
-    played_sets = set()
-    
     # Check dataframe for sets with actions
-    if 'set_number' in df.columns and len(df) > 0:
-        sets_with_data = df[df['set_number'].notna()]['set_number'].unique()
-        for set_num in sets_with_data:
-            set_df = df[df['set_number'] == set_num]
-            # Set is played if it has any rows
-            if len(set_df) > 0:
-                played_sets.add(int(set_num))
+    played_sets = set(_sets_with_actions(df))
     
     # Check loader for sets with rally data
     if loader is not None and hasattr(loader, 'team_data_by_rotation'):
@@ -60,6 +68,18 @@ def get_played_sets(df: pd.DataFrame, loader=None) -> List[int]:
     return sorted(list(played_sets))
 
 
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def _sets_with_actions(df: pd.DataFrame) -> List[int]:
+    """Return the set numbers that have at least one row in the dataframe.
+    
+    Cached on the dataframe content so set enumeration is not repeated by
+    every chart section on each rerun.
+    """
+    if 'set_number' not in df.columns or len(df) == 0:
+        return []
+    return [int(set_num) for set_num in df['set_number'].dropna().unique()]
+
+
 def create_match_flow_charts(analyzer: MatchAnalyzer, loader=None) -> None:
     """Create charts for Section 3: Match Flow & Momentum.
     
@@ -102,6 +122,9 @@ def create_skill_performance_charts(analyzer: MatchAnalyzer, loader=None) -> Non
     """
     df = analyzer.match_data
     
+    # Played sets and action masks shared by the attack, serve/reception and block sections
+    ctx = ChartContext.from_df(df, get_played_sets(df, loader))
+    
     # Tactical Distribution: Attack & Reception by Position
     st.markdown("### 📍 Tactical Distribution")
     col1, col2 = st.columns(2)
@@ -113,17 +136,17 @@ def create_skill_performance_charts(analyzer: MatchAnalyzer, loader=None) -> Non
     # Attacking Performance
     st.markdown("### 🎯 Attacking Performance")
     from charts.attack_charts import create_attacking_performance_charts
-    create_attacking_performance_charts(df, loader)
+    create_attacking_performance_charts(df, loader, ctx=ctx)
     
     # Serve and Reception Performance
     st.markdown("### 🎾 Serve and Reception Performance")
     from charts.serve_reception_charts import create_serve_reception_performance_charts
-    create_serve_reception_performance_charts(df, loader)
+    create_serve_reception_performance_charts(df, loader, ctx=ctx)
     
     # Blocking Performance
     st.markdown("### 🛡️ Blocking Performance")
     from charts.blocking_charts import create_blocking_performance_charts
-    create_blocking_performance_charts(df, loader)
+    create_blocking_performance_charts(df, loader, ctx=ctx)
 
 
 def create_team_charts(analyzer: MatchAnalyzer, loader=None) -> None:
@@ -139,6 +162,8 @@ def create_team_charts(analyzer: MatchAnalyzer, loader=None) -> None:
 def _create_action_distribution_chart(df: pd.DataFrame) -> None:
     """Create action distribution donut chart."""
     action_counts = df['action'].value_counts()
+    # Categorical columns report unused categories with a zero count
+    action_counts = action_counts[action_counts > 0]
     
     # Check if receive includes digs - if so, separate them
     # Since 'dig' and 'receive' are separate actions in VALID_ACTIONS, they should already be separate
@@ -147,19 +172,16 @@ def _create_action_distribution_chart(df: pd.DataFrame) -> None:
         # They're already separate, keep as is
         pass
     
-    fig_actions = px.pie(
+    fig_actions = go.Figure(data=[go.Pie(
+        labels=action_counts.index.tolist(),
         values=action_counts.values,
-        names=action_counts.index,
-        title="Action Distribution",
-        color_discrete_sequence=['#B8E6B8', '#B8D4E6', '#E6D4B8', '#E6B8D4', '#D4B8E6', '#B8E6D4', '#E6E6B8'],  # Soft pastels
-        hole=0.4  # Creates donut chart (40% hole)
-    )
-    fig_actions.update_traces(
+        hole=0.4,  # Creates donut chart (40% hole)
+        marker=dict(colors=ACTION_PIE_COLORS, line=dict(color='white', width=2)),
         textposition='inside',
         textinfo='percent',
-        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>',
-        marker=dict(line=dict(color='white', width=2))
-    )
+        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
+    )])
+    fig_actions.update_layout(title="Action Distribution")
     fig_actions = apply_beautiful_theme(fig_actions, "Action Distribution")
     st.plotly_chart(fig_actions, use_container_width=True, config=plotly_config, key="action_distribution")
     
@@ -174,41 +196,36 @@ def _create_outcome_distribution_chart(df: pd.DataFrame) -> None:
     """Create outcome distribution bar chart sorted by: Kill (with ace), Good, Error."""
     outcome_counts = df['outcome'].value_counts()
     
+    # Look up the fixed outcomes in one reindex (missing outcomes count as 0)
+    core = outcome_counts.reindex(CORE_OUTCOMES, fill_value=0)
+    
     # Combine ace with kill
-    kill_count = outcome_counts.get('kill', 0)
-    ace_count = outcome_counts.get('ace', 0)
-    combined_kill = kill_count + ace_count
+    combined_kill = int(core['kill'] + core['ace'])
     
     # Create ordered outcome counts
     ordered_outcomes = {}
     if combined_kill > 0:
         ordered_outcomes['Kill'] = combined_kill
-    if 'good' in outcome_counts.index:
-        ordered_outcomes['Good'] = outcome_counts['good']
-    if 'error' in outcome_counts.index:
-        ordered_outcomes['Error'] = outcome_counts['error']
+    if core['good'] > 0:
+        ordered_outcomes['Good'] = int(core['good'])
+    if core['error'] > 0:
+        ordered_outcomes['Error'] = int(core['error'])
     
     # Add any other outcomes that aren't kill, ace, good, or error
-    for outcome in outcome_counts.index:
-        if outcome not in ['kill', 'ace', 'good', 'error']:
-            ordered_outcomes[outcome.capitalize()] = outcome_counts[outcome]
-    
-    # Convert to series for plotting
-    ordered_series = pd.Series(ordered_outcomes)
-    
-    # Color mapping: Kill=Green, Good=Yellow/Gold, Error=Red (softened pastels)
-    color_map = {
-        'Kill': '#90EE90',  # Soft green
-        'Good': '#FFE4B5',  # Soft yellow/cream
-        'Error': '#FFB6C1'  # Soft pink/red
-    }
-    colors = [color_map.get(outcome, CHART_COLORS['primary']) for outcome in ordered_series.index]
+    extras = outcome_counts.drop(CORE_OUTCOMES, errors='ignore')
+    extras = extras[extras > 0]
+    ordered_outcomes.update(zip(extras.index.astype(str).str.capitalize(), extras.tolist()))
+    
+    # Plot straight from the dict; no intermediate Series needed
+    labels = list(ordered_outcomes)
+    values = np.fromiter(ordered_outcomes.values(), dtype=np.int32, count=len(ordered_outcomes))
+    colors = [OUTCOME_BAR_COLORS.get(outcome, CHART_COLORS['primary']) for outcome in labels]
     
     fig_outcomes = go.Figure(data=go.Bar(
-        x=ordered_series.index,
-        y=ordered_series.values,
+        x=labels,
+        y=values,
         marker_color=colors,
-        text=ordered_series.values,
+        text=values,
         textposition='outside',
         textfont=dict(size=11, color='#050d76')
     ))
@@ -263,10 +280,9 @@ def _create_attack_distribution_chart(df: pd.DataFrame) -> None:
         attacks['position_group'] = attacks['position'].apply(map_position_group)
     else:
         # Fallback: get position from player using helper function
-        from utils.helpers import get_player_position
         position_groups = {}
         for player in attacks['player'].unique():
-            position = get_player_position(df, player)
+            position = player_position(df, player)
             if position:
                 if position.startswith('MB'):
                     position_groups[player] = 'Middle Blocker'
@@ -541,10 +557,9 @@ def _create_reception_distribution_chart(df: pd.DataFrame) -> None:
         receptions['position_group'] = receptions['position'].apply(map_position_group)
     else:
         # Fallback: get position from player using helper function
-        from utils.helpers import get_player_position
         position_groups = {}
         for player in receptions['player'].unique():
-            position = get_player_position(df, player)
+            position = player_position(df, player)
             if position:
                 if position.startswith('MB'):
                     position_groups[player] = 'Middle Blocker'
@@ -809,34 +824,34 @@ def _create_quality_by_action_chart(df: pd.DataFrame, loader=None) -> None:
             if action == 'serve':
                 # For serves, combine ace with kill
                 kills = len(action_df[action_df['outcome'].isin(['kill', 'ace'])])
-                good = len(action_df[action_df['outcome'] == 'good'])
-                errors = len(action_df[action_df['outcome'] == 'error'])
+                good = int((action_df['outcome'] == 'good').sum())
+                errors = int((action_df['outcome'] == 'error').sum())
             elif action == 'block':
                 # For blocks, kills are kills, touches are touches
-                kills = len(action_df[action_df['outcome'] == 'kill'])
+                kills = int((action_df['outcome'] == 'kill').sum())
                 good = len(filter_block_touches(action_df))
-                errors = len(action_df[action_df['outcome'] == 'error'])
+                errors = int((action_df['outcome'] == 'error').sum())
             elif action == 'receive':
                 # For receptions, use new outcomes (perfect_0, good_1)
-                kills = len(action_df[action_df['outcome'] == 'kill'])
+                kills = int((action_df['outcome'] == 'kill').sum())
                 good = len(filter_good_receptions(action_df))
-                errors = len(action_df[action_df['outcome'] == 'error'])
+                errors = int((action_df['outcome'] == 'error').sum())
             elif action == 'dig':
                 # For digs, use new outcomes (perfect_0, good_1)
-                kills = len(action_df[action_df['outcome'] == 'kill'])
+                kills = int((action_df['outcome'] == 'kill').sum())
                 good = len(filter_good_digs(action_df))
-                errors = len(action_df[action_df['outcome'] == 'error'])
+                errors = int((action_df['outcome'] == 'error').sum())
             else:
                 # For other actions (attack, set)
-                kills = len(action_df[action_df['outcome'] == 'kill'])
+                kills = int((action_df['outcome'] == 'kill').sum())
                 # For attacks, 'defended' is good; for sets, 'good' is good
                 if action == 'attack':
-                    good = len(action_df[action_df['outcome'] == 'defended'])
+                    good = int((action_df['outcome'] == 'defended').sum())
                     # Attack errors: blocked, out, net (error removed - all errors covered)
-                    errors = len(action_df[action_df['outcome'].isin(['blocked', 'out', 'net'])])
+                    errors = len(action_df[action_df['outcome'].isin(ATTACK_ERROR_OUTCOMES)])
                 else:
-                    good = len(action_df[action_df['outcome'] == 'good'])
-                    errors = len(action_df[action_df['outcome'] == 'error'])
+                    good = int((action_df['outcome'] == 'good').sum())
+                    errors = int((action_df['outcome'] == 'error').sum())
         
         # Only add if we have data
         if kills + good + errors > 0:
@@ -923,6 +938,18 @@ def _create_set_by_set_charts(df: pd.DataFrame, analyzer: MatchAnalyzer, loader=
         st.info("No set data available to display.")
         return
     
+    # Action masks are built once and narrowed to each set by the fallbacks below
+    ctx = ChartContext.from_df(df, played_sets)
+    
+    # Reception fallback counts per set, computed once for both reception metrics
+    receive_counts = outcome_counts_by_set(df, 'receive')
+    good_receives_by_set = receive_counts.reindex(columns=list(GOOD_PASS_OUTCOMES), fill_value=0).sum(axis=1)
+    receives_by_set = receive_counts.sum(axis=1)
+    reception_errors_by_set = receive_counts.reindex(columns=['error'], fill_value=0)['error']
+    
+    # Rows of each set, split once for the per-set fallbacks
+    set_frames = dict(tuple(df.groupby('set_number', sort=False)))
+    
     # Calculate set-level metrics using aggregated data
     set_metrics_data = []
     
@@ -956,9 +983,8 @@ def _create_set_by_set_charts(df: pd.DataFrame, analyzer: MatchAnalyzer, loader=
             metrics['attack_kill_pct'] = (attack_kills / attack_total) if attack_total > 0 else 0.0
         else:
             # Fallback to action rows
-            set_df = df[df['set_number'] == set_num]
-            attacks = set_df[set_df['action'] == 'attack']
-            attack_kills = len(attacks[attacks['outcome'] == 'kill'])
+            attacks = df[ctx.action_mask('attack', set_num)]
+            attack_kills = int((attacks['outcome'] == 'kill').sum())
             attack_total = len(attacks)
             metrics['attack_kill_pct'] = (attack_kills / attack_total) if attack_total > 0 else 0.0
         
@@ -973,10 +999,8 @@ def _create_set_by_set_charts(df: pd.DataFrame, analyzer: MatchAnalyzer, loader=
             metrics['reception_quality'] = (rec_good / rec_total) if rec_total > 0 else 0.0
         else:
             # Fallback to action rows
-            set_df = df[df['set_number'] == set_num]
-            receives = set_df[set_df['action'] == 'receive']
-            rec_good = len(filter_good_receptions(receives))
-            rec_total = len(receives)
+            rec_good = int(good_receives_by_set.get(set_num, 0))
+            rec_total = int(receives_by_set.get(set_num, 0))
             metrics['reception_quality'] = (rec_good / rec_total) if rec_total > 0 else 0.0
         
         # 5. Attack Quality Distribution (Kills, Good, Errors)
@@ -995,13 +1019,12 @@ def _create_set_by_set_charts(df: pd.DataFrame, analyzer: MatchAnalyzer, loader=
             metrics['attack_good'] = attack_good
             metrics['attack_errors'] = attack_errors
         else:
-            set_df = df[df['set_number'] == set_num]
-            attacks = set_df[set_df['action'] == 'attack']
-            metrics['attack_kills'] = len(attacks[attacks['outcome'] == 'kill'])
+            attacks = df[ctx.action_mask('attack', set_num)]
+            metrics['attack_kills'] = int((attacks['outcome'] == 'kill').sum())
             # Attack 'defended' is considered good (kept in play)
-            metrics['attack_good'] = len(attacks[attacks['outcome'] == 'defended'])
+            metrics['attack_good'] = int((attacks['outcome'] == 'defended').sum())
             # Attack errors: blocked, out, net (error removed - all errors covered)
-            metrics['attack_errors'] = len(attacks[attacks['outcome'].isin(['blocked', 'out', 'net'])])
+            metrics['attack_errors'] = len(attacks[attacks['outcome'].isin(ATTACK_ERROR_OUTCOMES)])
         
         # 6. Service Quality Distribution (Aces, Good, Errors)
         if loader and hasattr(loader, 'player_data_by_set') and set_num in loader.player_data_by_set:
@@ -1019,11 +1042,10 @@ def _create_set_by_set_charts(df: pd.DataFrame, analyzer: MatchAnalyzer, loader=
             metrics['service_errors'] = service_errors
             metrics['service_in_rate'] = ((service_aces + service_good) / service_total) if service_total > 0 else 0.0
         else:
-            set_df = df[df['set_number'] == set_num]
-            serves = set_df[set_df['action'] == 'serve']
-            metrics['service_aces'] = len(serves[serves['outcome'] == 'ace'])
-            metrics['service_good'] = len(serves[serves['outcome'] == 'good'])
-            metrics['service_errors'] = len(serves[serves['outcome'] == 'error'])
+            serves = df[ctx.action_mask('serve', set_num)]
+            metrics['service_aces'] = int((serves['outcome'] == 'ace').sum())
+            metrics['service_good'] = int((serves['outcome'] == 'good').sum())
+            metrics['service_errors'] = int((serves['outcome'] == 'error').sum())
             service_total = len(serves)
             metrics['service_in_rate'] = ((metrics['service_aces'] + metrics['service_good']) / service_total) if service_total > 0 else 0.0
         
@@ -1043,11 +1065,10 @@ def _create_set_by_set_charts(df: pd.DataFrame, analyzer: MatchAnalyzer, loader=
             metrics['block_errors'] = block_errors
             metrics['block_kill_pct'] = (block_kills / block_total) if block_total > 0 else 0.0
         else:
-            set_df = df[df['set_number'] == set_num]
-            blocks = set_df[set_df['action'] == 'block']
-            metrics['block_kills'] = len(blocks[blocks['outcome'] == 'kill'])
+            blocks = df[ctx.action_mask('block', set_num)]
+            metrics['block_kills'] = int((blocks['outcome'] == 'kill').sum())
             metrics['block_touches'] = len(filter_block_touches(blocks))
-            metrics['block_errors'] = len(blocks[blocks['outcome'] == 'error'])
+            metrics['block_errors'] = int((blocks['outcome'] == 'error').sum())
             block_total = len(blocks)
             metrics['block_kill_pct'] = (metrics['block_kills'] / block_total) if block_total > 0 else 0.0
         
@@ -1062,10 +1083,8 @@ def _create_set_by_set_charts(df: pd.DataFrame, analyzer: MatchAnalyzer, loader=
             metrics['reception_good'] = rec_good
             metrics['reception_errors'] = rec_total - rec_good
         else:
-            set_df = df[df['set_number'] == set_num]
-            receives = set_df[set_df['action'] == 'receive']
-            metrics['reception_good'] = len(filter_good_receptions(receives))
-            metrics['reception_errors'] = len(receives[receives['outcome'] == 'error'])
+            metrics['reception_good'] = int(good_receives_by_set.get(set_num, 0))
+            metrics['reception_errors'] = int(reception_errors_by_set.get(set_num, 0))
         
         # 9. Dig Rate (from aggregated data)
         if loader and hasattr(loader, 'player_data_by_set') and set_num in loader.player_data_by_set:
@@ -1077,8 +1096,7 @@ def _create_set_by_set_charts(df: pd.DataFrame, analyzer: MatchAnalyzer, loader=
                 dig_total += float(stats.get('Dig_Total', 0) or 0)
             metrics['dig_rate'] = (dig_good / dig_total) if dig_total > 0 else 0.0
         else:
-            set_df = df[df['set_number'] == set_num]
-            digs = set_df[set_df['action'] == 'dig']
+            digs = df[ctx.action_mask('dig', set_num)]
             dig_good = len(filter_good_digs(digs))
             dig_total = len(digs)
             metrics['dig_rate'] = (dig_good / dig_total) if dig_total > 0 else 0.0
@@ -1109,8 +1127,8 @@ def _create_set_by_set_charts(df: pd.DataFrame, analyzer: MatchAnalyzer, loader=
                 total_actions += rec_total
             metrics['error_rate'] = (total_errors / total_actions) if total_actions > 0 else 0.0
         else:
-            set_df = df[df['set_number'] == set_num]
-            total_errors = len(set_df[set_df['outcome'] == 'error'])
+            set_df = set_frames.get(set_num, df.iloc[:0])
+            total_errors = int((set_df['outcome'] == 'error').sum())
             total_actions = len(set_df)
             metrics['error_rate'] = (total_errors / total_actions) if total_actions > 0 else 0.0
         
@@ -1199,14 +1217,13 @@ def _create_set_by_set_charts(df: pd.DataFrame, analyzer: MatchAnalyzer, loader=
         attack_details_by_set = {}
         played_sets = get_played_sets(df, loader)
         for set_num in played_sets:
-            set_df = df[df['set_number'] == set_num]
-            attacks = set_df[set_df['action'] == 'attack']
+            attacks = df[ctx.action_mask('attack', set_num)]
             attack_details_by_set[set_num] = {
-                'kill': len(attacks[attacks['outcome'] == 'kill']),
-                'defended': len(attacks[attacks['outcome'] == 'defended']),
-                'blocked': len(attacks[attacks['outcome'] == 'blocked']),
-                'out': len(attacks[attacks['outcome'] == 'out']),
-                'net': len(attacks[attacks['outcome'] == 'net'])
+                'kill': int((attacks['outcome'] == 'kill').sum()),
+                'defended': int((attacks['outcome'] == 'defended').sum()),
+                'blocked': int((attacks['outcome'] == 'blocked').sum()),
+                'out': int((attacks['outcome'] == 'out').sum()),
+                'net': int((attacks['outcome'] == 'net').sum())
                 # 'error' removed from attack outcomes - all errors covered by 'blocked', 'out', 'net'
             }
         
@@ -1346,13 +1363,12 @@ def _create_set_by_set_charts(df: pd.DataFrame, analyzer: MatchAnalyzer, loader=
     # Get detailed reception outcomes from dataframe
     reception_details_by_set = {}
     for set_num in played_sets:
-        set_df = df[df['set_number'] == set_num]
-        receives = set_df[set_df['action'] == 'receive']
+        receives = df[ctx.action_mask('receive', set_num)]
         reception_details_by_set[set_num] = {
-            'perfect': len(receives[receives['outcome'] == 'perfect']),
-            'good': len(receives[receives['outcome'] == 'good']),
-            'poor': len(receives[receives['outcome'] == 'poor']),
-            'error': len(receives[receives['outcome'] == 'error'])
+            'perfect': int((receives['outcome'] == 'perfect').sum()),
+            'good': int((receives['outcome'] == 'good').sum()),
+            'poor': int((receives['outcome'] == 'poor').sum()),
+            'error': int((receives['outcome'] == 'error').sum())
         }
     
     fig_reception = go.Figure()
@@ -1423,8 +1439,9 @@ def _create_attack_type_distribution_chart(df: pd.DataFrame, loader=None) -> Non
     played_sets = get_played_sets(df, loader)
     
     attack_type_data_by_set = {}
+    set_frames = dict(tuple(df.groupby('set_number', sort=False)))
     for set_num in played_sets:
-        set_df = df[df['set_number'] == set_num]
+        set_df = set_frames.get(set_num, df.iloc[:0])
         set_breakdown = get_attack_breakdown_by_type(set_df, loader)
         attack_type_data_by_set[set_num] = set_breakdown
     
@@ -1474,9 +1491,10 @@ def _create_attack_type_distribution_chart(df: pd.DataFrame, loader=None) -> Non
     
     if played_sets:
         cols = st.columns(len(played_sets))
+        set_frames = dict(tuple(df.groupby('set_number', sort=False)))
         for idx, set_num in enumerate(played_sets):
             with cols[idx]:
-                set_df = df[df['set_number'] == set_num]
+                set_df = set_frames.get(set_num, df.iloc[:0])
                 set_breakdown = get_attack_breakdown_by_type(set_df, loader)
                 
                 # Prepare data for donut chart - ensure consistent order
@@ -1535,16 +1553,12 @@ def _create_rally_length_distribution_chart(df: pd.DataFrame, loader=None) -> No
     st.markdown("#### 📏 Rally Length Distribution")
     
     # Calculate rally lengths from point_id groupings
-    rally_lengths = []
-    
     if 'point_id' in df.columns:
         # Group by point_id to get rally length (number of actions per rally)
-        for point_id, group in df.groupby('point_id'):
-            rally_lengths.append(len(group))
+        rally_lengths = df.groupby('point_id', sort=False, observed=True).size().tolist()
     elif 'point' in df.columns and 'set_number' in df.columns:
         # Fallback: group by set and point
-        for (set_num, point), group in df.groupby(['set_number', 'point']):
-            rally_lengths.append(len(group))
+        rally_lengths = df.groupby(['set_number', 'point'], sort=False, observed=True).size().tolist()
     else:
         st.info("Cannot calculate rally lengths: missing point_id or point column")
         return
@@ -1853,7 +1867,7 @@ def _create_rotation_heatmap(rotation_stats: Dict[int, Dict[str, float]],
             total_points_all_rotations = float(points_df['point_id'].nunique())
         else:
             # Fallback: count by set and point
-            total_points_all_rotations = float(len(points_df.groupby(['set_number', 'point_id']).size()) if 'point_id' in points_df.columns else len(points_df.groupby(['set_number', 'point']).size()))
+            total_points_all_rotations = float(len(points_df.groupby(['set_number', 'point_id'], sort=False, observed=True).size()) if 'point_id' in points_df.columns else len(points_df.groupby(['set_number', 'point'], sort=False, observed=True).size()))
     
     for rotation in rotations:
         rotation_data = filtered_df[filtered_df['rotation'] == rotation]
@@ -1911,7 +1925,7 @@ def _create_rotation_heatmap(rotation_stats: Dict[int, Dict[str, float]],
                 rotation_points = float(rotation_data['point_id'].nunique())
             else:
                 # Fallback: count by set and point
-                rotation_points = float(len(rotation_data.groupby(['set_number', 'point_id']).size()) if 'point_id' in rotation_data.columns else len(rotation_data.groupby(['set_number', 'point']).size()))
+                rotation_points = float(len(rotation_data.groupby(['set_number', 'point_id'], sort=False, observed=True).size()) if 'point_id' in rotation_data.columns else len(rotation_data.groupby(['set_number', 'point'], sort=False, observed=True).size()))
         
         # Calculate rates - avoid division by zero
         # Track whether we have data for each metric
@@ -1929,7 +1943,7 @@ def _create_rotation_heatmap(rotation_stats: Dict[int, Dict[str, float]],
         
         # Kill Percentage: Attack kills / total attacks (from filtered dataframe)
         attacks = rotation_data[rotation_data['action'] == 'attack']
-        attack_kills = len(attacks[attacks['outcome'] == 'kill'])
+        attack_kills = int((attacks['outcome'] == 'kill').sum())
         attack_attempts = len(attacks)
         has_attack_data = attack_attempts > 0
         kill_percentage = KPICalculator.calculate_attack_kill_pct_from_totals(
@@ -2735,7 +2749,6 @@ def _create_attacking_performance_charts(df: pd.DataFrame, analyzer: MatchAnalyz
     cols = st.columns(4)
     
     # Fixed order for consistent legend: Normal, Tip
-    attack_type_order = ['Normal', 'Tip']
     attack_type_color_map = {
         'Normal': ATTACK_TYPE_COLORS['normal'],
         'Tip': ATTACK_TYPE_COLORS['tip']
@@ -2754,61 +2767,17 @@ def _create_attacking_performance_charts(df: pd.DataFrame, analyzer: MatchAnalyz
             breakdown = get_attack_breakdown_by_type(filtered_df, loader)
             
             if breakdown:
-                normal_total = breakdown['normal']['total']
-                tip_total = breakdown['tip']['total']
-                total_attacks = normal_total + tip_total
-                
-                if total_attacks > 0:
-                    # Build labels/values/colors in fixed order for consistent legend
-                    labels = []
-                    values = []
-                    colors = []
-                    
-                    type_data = {
-                        'Normal': normal_total,
-                        'Tip': tip_total
-                    }
-                    
-                    for attack_type in attack_type_order:
-                        count = type_data[attack_type]
-                        if count > 0:
-                            labels.append(attack_type)
-                            values.append(count)
-                            colors.append(attack_type_color_map[attack_type])
-                    
-                    if labels:
-                        fig = go.Figure(data=[go.Pie(
-                            labels=labels,
-                            values=values,
-                            hole=0.4,
-                            marker=dict(colors=colors, line=dict(color='white', width=2)),
-                            textinfo='percent',  # Only show percentage, not label names
-                            textfont=dict(size=14, color='#050d76', family='Inter, sans-serif'),  # Larger font for percentages
-                            hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-                        )])
-                        fig.update_layout(
-                            title=f"{title} (n={total_attacks})",
-                            height=CHART_HEIGHTS['large'],  # Larger chart
-                            showlegend=True,
-                            legend=dict(
-                                orientation="v",
-                                yanchor="top",
-                                y=1,
-                                xanchor="left",
-                                x=1.02,
-                                itemsizing='constant'  # Consistent legend item sizing
-                            ),
-                            margin=dict(l=0, r=100, t=50, b=0),  # Reduce margins for bigger chart
-                            font=dict(family='Inter, sans-serif', size=11, color='#050d76')
-                        )
-                        fig = apply_beautiful_theme(fig, f"{title} Attack Types")
-                        st.plotly_chart(fig, use_container_width=True, config=plotly_config, key=f"attack_type_donut_{set_option.replace(' ', '_')}")
+                # Fixed order for consistent legend
+                _draw_section_donut(
+                    {'Normal': breakdown['normal']['total'], 'Tip': breakdown['tip']['total']},
+                    attack_type_color_map, f"{title} Attack Types",
+                    f"attack_type_donut_{set_option.replace(' ', '_')}"
+                )
     
     # 2. Attack Quality Distribution by Set - 4 donut charts (All Sets + one per set)
     st.markdown("#### Attack Quality Distribution by Set")
     
     # Fixed order for consistent legend: Kills, Good (Defended), Errors
-    quality_order = ['Kills', 'Good (Defended)', 'Errors']
     quality_color_map = {
         'Kills': OUTCOME_COLORS['kill'],
         'Good (Defended)': OUTCOME_COLORS['good'],
@@ -2817,130 +2786,46 @@ def _create_attacking_performance_charts(df: pd.DataFrame, analyzer: MatchAnalyz
     
     # Prepare data for all sets combined
     all_attacks = df[df['action'] == 'attack']
-    all_kills = len(all_attacks[all_attacks['outcome'] == 'kill'])
-    all_defended = len(all_attacks[all_attacks['outcome'] == 'defended'])
+    all_kills = int((all_attacks['outcome'] == 'kill').sum())
+    all_defended = int((all_attacks['outcome'] == 'defended').sum())
     all_errors = (
-        len(all_attacks[all_attacks['outcome'] == 'blocked']) +
-        len(all_attacks[all_attacks['outcome'] == 'out']) +
-        len(all_attacks[all_attacks['outcome'] == 'net'])
+        int((all_attacks['outcome'] == 'blocked').sum()) +
+        int((all_attacks['outcome'] == 'out').sum()) +
+        int((all_attacks['outcome'] == 'net').sum())
         # 'error' removed - all errors covered by 'blocked', 'out', 'net'
     )
-    all_total = all_kills + all_defended + all_errors
     
     # Create 4 columns: All Sets + one for each set
     cols = st.columns(4)
     
     # All Sets donut chart
     with cols[0]:
-        if all_total > 0:
-            labels = []
-            values = []
-            colors = []
-            
-            quality_data = {
-                'Kills': all_kills,
-                'Good (Defended)': all_defended,
-                'Errors': all_errors
-            }
-            
-            for quality_type in quality_order:
-                count = quality_data[quality_type]
-                if count > 0:
-                    labels.append(quality_type)
-                    values.append(count)
-                    colors.append(quality_color_map[quality_type])
-            
-            if labels:
-                fig = go.Figure(data=[go.Pie(
-                    labels=labels,
-                    values=values,
-                    hole=0.4,
-                    marker=dict(colors=colors, line=dict(color='white', width=2)),
-                    textinfo='percent',  # Only show percentage, not label names
-                    textfont=dict(size=14, color='#050d76', family='Inter, sans-serif'),  # Larger font for percentages
-                    hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-                )])
-                fig.update_layout(
-                    title=f"All Sets (n={all_total})",
-                    height=CHART_HEIGHTS['large'],  # Larger chart
-                    showlegend=True,
-                    legend=dict(
-                        orientation="v",
-                        yanchor="top",
-                        y=1,
-                        xanchor="left",
-                        x=1.02,
-                        itemsizing='constant'  # Consistent legend item sizing
-                    ),
-                    margin=dict(l=0, r=100, t=50, b=0),  # Reduce margins for bigger chart
-                    font=dict(family='Inter, sans-serif', size=11, color='#050d76')
-                )
-                fig = apply_beautiful_theme(fig, "All Sets Attack Quality")
-                st.plotly_chart(fig, use_container_width=True, config=plotly_config, key="attack_quality_donut_all")
+        _draw_section_donut(
+            {'Kills': all_kills, 'Good (Defended)': all_defended, 'Errors': all_errors},
+            quality_color_map, "All Sets Attack Quality", "attack_quality_donut_all"
+        )
     
-    # Individual set donut charts
+    # Individual set donut charts, sliced from one split of the rows by set
+    set_frames = dict(tuple(df.groupby('set_number', sort=False)))
     for idx, set_num in enumerate(played_sets[:3], start=1):  # Limit to 3 sets (plus "All Sets" = 4 total)
         if idx >= len(cols):
             break
         with cols[idx]:
-            set_df = df[df['set_number'] == set_num]
+            set_df = set_frames.get(set_num, df.iloc[:0])
             attacks = set_df[set_df['action'] == 'attack']
             
-            kills = len(attacks[attacks['outcome'] == 'kill'])
-            defended = len(attacks[attacks['outcome'] == 'defended'])
+            kills = int((attacks['outcome'] == 'kill').sum())
+            defended = int((attacks['outcome'] == 'defended').sum())
             errors = (
-                len(attacks[attacks['outcome'] == 'blocked']) +
-                len(attacks[attacks['outcome'] == 'out']) +
-                len(attacks[attacks['outcome'] == 'net']) +
-                len(attacks[attacks['outcome'] == 'error'])
+                int((attacks['outcome'] == 'blocked').sum()) +
+                int((attacks['outcome'] == 'out').sum()) +
+                int((attacks['outcome'] == 'net').sum()) +
+                int((attacks['outcome'] == 'error').sum())
+            )
+            _draw_section_donut(
+                {'Kills': kills, 'Good (Defended)': defended, 'Errors': errors},
+                quality_color_map, f"Set {set_num} Attack Quality", f"attack_quality_donut_set_{set_num}"
             )
-            total = kills + defended + errors
-            
-            if total > 0:
-                labels = []
-                values = []
-                colors = []
-                
-                quality_data = {
-                    'Kills': kills,
-                    'Good (Defended)': defended,
-                    'Errors': errors
-                }
-                
-                for quality_type in quality_order:
-                    count = quality_data[quality_type]
-                    if count > 0:
-                        labels.append(quality_type)
-                        values.append(count)
-                        colors.append(quality_color_map[quality_type])
-                
-                if labels:
-                    fig = go.Figure(data=[go.Pie(
-                        labels=labels,
-                        values=values,
-                        hole=0.4,
-                        marker=dict(colors=colors, line=dict(color='white', width=2)),
-                        textinfo='percent',  # Only show percentage, not label names
-                        textfont=dict(size=14, color='#050d76', family='Inter, sans-serif'),  # Larger font for percentages
-                        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-                    )])
-                    fig.update_layout(
-                        title=f"Set {set_num} (n={total})",
-                        height=CHART_HEIGHTS['large'],  # Larger chart
-                        showlegend=True,
-                        legend=dict(
-                            orientation="v",
-                            yanchor="top",
-                            y=1,
-                            xanchor="left",
-                            x=1.02,
-                            itemsizing='constant'  # Consistent legend item sizing
-                        ),
-                        margin=dict(l=0, r=100, t=50, b=0),  # Reduce margins for bigger chart
-                        font=dict(family='Inter, sans-serif', size=11, color='#050d76')
-                    )
-                    fig = apply_beautiful_theme(fig, f"Set {set_num} Attack Quality")
-                    st.plotly_chart(fig, use_container_width=True, config=plotly_config, key=f"attack_quality_donut_set_{set_num}")
 
 
 def _create_reception_performance_charts(df: pd.DataFrame, loader=None) -> None:
@@ -2954,7 +2839,6 @@ def _create_reception_performance_charts(df: pd.DataFrame, loader=None) -> None:
     played_sets = get_played_sets(df, loader)
     
     # Fixed order for consistent legend: Perfect, Good, Poor, Error
-    reception_order = ['Perfect', 'Good', 'Poor', 'Error']
     reception_color_map = {
         'Perfect': OUTCOME_COLORS['perfect'],
         'Good': OUTCOME_COLORS['good'],
@@ -2964,124 +2848,38 @@ def _create_reception_performance_charts(df: pd.DataFrame, loader=None) -> None:
     
     # Prepare data for all sets combined
     all_receives = df[df['action'] == 'receive']
-    all_perfect = len(all_receives[all_receives['outcome'] == 'perfect'])
-    all_good = len(all_receives[all_receives['outcome'] == 'good'])
-    all_poor = len(all_receives[all_receives['outcome'] == 'poor'])
-    all_error = len(all_receives[all_receives['outcome'] == 'error'])
-    all_total = all_perfect + all_good + all_poor + all_error
+    all_perfect = int((all_receives['outcome'] == 'perfect').sum())
+    all_good = int((all_receives['outcome'] == 'good').sum())
+    all_poor = int((all_receives['outcome'] == 'poor').sum())
+    all_error = int((all_receives['outcome'] == 'error').sum())
     
     # Create 4 columns: All Sets + one for each set
     cols = st.columns(4)
     
     # All Sets donut chart
     with cols[0]:
-        if all_total > 0:
-            labels = []
-            values = []
-            colors = []
-            
-            reception_data = {
-                'Perfect': all_perfect,
-                'Good': all_good,
-                'Poor': all_poor,
-                'Error': all_error
-            }
-            
-            for rec_type in reception_order:
-                count = reception_data[rec_type]
-                if count > 0:
-                    labels.append(rec_type)
-                    values.append(count)
-                    colors.append(reception_color_map[rec_type])
-            
-            if labels:
-                fig = go.Figure(data=[go.Pie(
-                    labels=labels,
-                    values=values,
-                    hole=0.4,
-                    marker=dict(colors=colors, line=dict(color='white', width=2)),
-                    textinfo='percent',  # Only show percentage, not label names
-                    textfont=dict(size=14, color='#050d76', family='Inter, sans-serif'),  # Larger font for percentages
-                    hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-                )])
-                fig.update_layout(
-                    title=f"All Sets (n={all_total})",
-                    height=CHART_HEIGHTS['large'],  # Larger chart
-                    showlegend=True,
-                    legend=dict(
-                        orientation="v",
-                        yanchor="top",
-                        y=1,
-                        xanchor="left",
-                        x=1.02,
-                        itemsizing='constant'  # Consistent legend item sizing
-                    ),
-                    margin=dict(l=0, r=100, t=50, b=0),  # Reduce margins for bigger chart
-                    font=dict(family='Inter, sans-serif', size=11, color='#050d76')
-                )
-                fig = apply_beautiful_theme(fig, "All Sets Reception")
-                st.plotly_chart(fig, use_container_width=True, config=plotly_config, key="reception_donut_all")
+        _draw_section_donut(
+            {'Perfect': all_perfect, 'Good': all_good, 'Poor': all_poor, 'Error': all_error},
+            reception_color_map, "All Sets Reception", "reception_donut_all"
+        )
     
-    # Individual set donut charts
+    # Individual set donut charts, sliced from one split of the rows by set
+    set_frames = dict(tuple(df.groupby('set_number', sort=False)))
     for idx, set_num in enumerate(played_sets[:3], start=1):  # Limit to 3 sets (plus "All Sets" = 4 total)
         if idx >= len(cols):
             break
         with cols[idx]:
-            set_df = df[df['set_number'] == set_num]
+            set_df = set_frames.get(set_num, df.iloc[:0])
             receives = set_df[set_df['action'] == 'receive']
             
-            perfect = len(receives[receives['outcome'] == 'perfect'])
-            good = len(receives[receives['outcome'] == 'good'])
-            poor = len(receives[receives['outcome'] == 'poor'])
-            error = len(receives[receives['outcome'] == 'error'])
-            total = perfect + good + poor + error
-            
-            if total > 0:
-                labels = []
-                values = []
-                colors = []
-                
-                reception_data = {
-                    'Perfect': perfect,
-                    'Good': good,
-                    'Poor': poor,
-                    'Error': error
-                }
-                
-                for rec_type in reception_order:
-                    count = reception_data[rec_type]
-                    if count > 0:
-                        labels.append(rec_type)
-                        values.append(count)
-                        colors.append(reception_color_map[rec_type])
-                
-                if labels:
-                    fig = go.Figure(data=[go.Pie(
-                        labels=labels,
-                        values=values,
-                        hole=0.4,
-                        marker=dict(colors=colors, line=dict(color='white', width=2)),
-                        textinfo='percent',  # Only show percentage, not label names
-                        textfont=dict(size=14, color='#050d76', family='Inter, sans-serif'),  # Larger font for percentages
-                        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-                    )])
-                    fig.update_layout(
-                        title=f"Set {set_num} (n={total})",
-                        height=CHART_HEIGHTS['large'],  # Larger chart
-                        showlegend=True,
-                        legend=dict(
-                            orientation="v",
-                            yanchor="top",
-                            y=1,
-                            xanchor="left",
-                            x=1.02,
-                            itemsizing='constant'  # Consistent legend item sizing
-                        ),
-                        margin=dict(l=0, r=100, t=50, b=0),  # Reduce margins for bigger chart
-                        font=dict(family='Inter, sans-serif', size=11, color='#050d76')
-                    )
-                    fig = apply_beautiful_theme(fig, f"Set {set_num} Reception")
-                    st.plotly_chart(fig, use_container_width=True, config=plotly_config, key=f"reception_donut_set_{set_num}")
+            perfect = int((receives['outcome'] == 'perfect').sum())
+            good = int((receives['outcome'] == 'good').sum())
+            poor = int((receives['outcome'] == 'poor').sum())
+            error = int((receives['outcome'] == 'error').sum())
+            _draw_section_donut(
+                {'Perfect': perfect, 'Good': good, 'Poor': poor, 'Error': error},
+                reception_color_map, f"Set {set_num} Reception", f"reception_donut_set_{set_num}"
+            )
 
 
 def _create_serving_performance_charts(df: pd.DataFrame, loader=None) -> None:
@@ -3093,273 +2891,93 @@ def _create_serving_performance_charts(df: pd.DataFrame, loader=None) -> None:
     st.markdown("#### Serve Performance by Set")
     played_sets = get_played_sets(df, loader)
     
-    # Fixed order for consistent legend: Aces, Good, Errors
-    serve_order = ['Aces', 'Good', 'Errors']
-    serve_color_map = {
-        'Aces': OUTCOME_COLORS['ace'],
-        'Good': OUTCOME_COLORS['good'],
-        'Errors': OUTCOME_COLORS['error']
-    }
-    
-    # Prepare data for all sets combined
-    all_serves = df[df['action'] == 'serve']
-    all_aces = len(all_serves[all_serves['outcome'] == 'ace'])
-    all_good = len(all_serves[all_serves['outcome'] == 'good'])
-    all_errors = len(all_serves[all_serves['outcome'] == 'error'])
-    all_total = all_aces + all_good + all_errors
+    # Ace/good/error counts per set from one pass over the cached outcome counts
+    serve_counts = outcome_counts_by_set(df, 'serve').reindex(columns=['ace', 'good', 'error'], fill_value=0)
     
     # Create 4 columns: All Sets + one for each set
     cols = st.columns(4)
     
     # All Sets donut chart
     with cols[0]:
-        if all_total > 0:
-            labels = []
-            values = []
-            colors = []
-            
-            serve_data = {
-                'Aces': all_aces,
-                'Good': all_good,
-                'Errors': all_errors
-            }
-            
-            for serve_type in serve_order:
-                count = serve_data[serve_type]
-                if count > 0:
-                    labels.append(serve_type)
-                    values.append(count)
-                    colors.append(serve_color_map[serve_type])
-            
-            if labels:
-                fig = go.Figure(data=[go.Pie(
-                    labels=labels,
-                    values=values,
-                    hole=0.4,
-                    marker=dict(colors=colors, line=dict(color='white', width=2)),
-                    textinfo='percent',  # Only show percentage, not label names
-                    textfont=dict(size=14, color='#050d76', family='Inter, sans-serif'),  # Larger font for percentages
-                    hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-                )])
-                fig.update_layout(
-                    title=f"All Sets (n={all_total})",
-                    height=CHART_HEIGHTS['large'],  # Larger chart
-                    showlegend=True,
-                    legend=dict(
-                        orientation="v",
-                        yanchor="top",
-                        y=1,
-                        xanchor="left",
-                        x=1.02,
-                        itemsizing='constant'  # Consistent legend item sizing
-                    ),
-                    margin=dict(l=0, r=100, t=50, b=0),  # Reduce margins for bigger chart
-                    font=dict(family='Inter, sans-serif', size=11, color='#050d76')
-                )
-                fig = apply_beautiful_theme(fig, "All Sets Serve Performance")
-                st.plotly_chart(fig, use_container_width=True, config=plotly_config, key="serve_donut_all")
+        _draw_section_serve_donut(serve_counts.sum(), "All Sets Serve Performance", "serve_donut_all")
     
     # Individual set donut charts
     for idx, set_num in enumerate(played_sets[:3], start=1):  # Limit to 3 sets (plus "All Sets" = 4 total)
         if idx >= len(cols):
             break
         with cols[idx]:
-            set_df = df[df['set_number'] == set_num]
-            serves_set = set_df[set_df['action'] == 'serve']
-            
-            aces = len(serves_set[serves_set['outcome'] == 'ace'])
-            good = len(serves_set[serves_set['outcome'] == 'good'])
-            errors = len(serves_set[serves_set['outcome'] == 'error'])
-            total = aces + good + errors
-            
-            if total > 0:
-                labels = []
-                values = []
-                colors = []
-                
-                serve_data = {
-                    'Aces': aces,
-                    'Good': good,
-                    'Errors': errors
-                }
-                
-                for serve_type in serve_order:
-                    count = serve_data[serve_type]
-                    if count > 0:
-                        labels.append(serve_type)
-                        values.append(count)
-                        colors.append(serve_color_map[serve_type])
-                
-                if labels:
-                    fig = go.Figure(data=[go.Pie(
-                        labels=labels,
-                        values=values,
-                        hole=0.4,
-                        marker=dict(colors=colors, line=dict(color='white', width=2)),
-                        textinfo='percent',  # Only show percentage, not label names
-                        textfont=dict(size=14, color='#050d76', family='Inter, sans-serif'),  # Larger font for percentages
-                        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-                    )])
-                    fig.update_layout(
-                        title=f"Set {set_num} (n={total})",
-                        height=CHART_HEIGHTS['large'],  # Larger chart
-                        showlegend=True,
-                        legend=dict(
-                            orientation="v",
-                            yanchor="top",
-                            y=1,
-                            xanchor="left",
-                            x=1.02,
-                            itemsizing='constant'  # Consistent legend item sizing
-                        ),
-                        margin=dict(l=0, r=100, t=50, b=0),  # Reduce margins for bigger chart
-                        font=dict(family='Inter, sans-serif', size=11, color='#050d76')
-                    )
-                    fig = apply_beautiful_theme(fig, f"Set {set_num} Serve Performance")
-                    st.plotly_chart(fig, use_container_width=True, config=plotly_config, key=f"serve_donut_set_{set_num}")
+            set_counts = serve_counts.loc[set_num] if set_num in serve_counts.index else pd.Series(0, index=serve_counts.columns)
+            _draw_section_serve_donut(set_counts, f"Set {set_num} Serve Performance", f"serve_donut_set_{set_num}")
 
 
-def _create_blocking_performance_charts(df: pd.DataFrame, loader=None) -> None:
-    """Create all blocking performance charts for Section 4.
+def _draw_section_serve_donut(counts: pd.Series, title: str, key: str) -> None:
+    """Draw one Section 4 serve donut.
     
-    Includes:
-    - Block Performance by Set (4 donut charts: All Sets + one per set)
+    Args:
+        counts: Serve counts indexed by 'ace', 'good' and 'error'
+        title: Chart title
+        key: Unique Streamlit key
     """
-    st.markdown("#### Block Performance by Set")
-    played_sets = get_played_sets(df, loader)
+    _draw_section_donut(
+        {label: int(counts[outcome]) for outcome, label in SERVE_DONUT_LABELS.items()},
+        {label: OUTCOME_COLORS[outcome] for outcome, label in SERVE_DONUT_LABELS.items()},
+        title, key
+    )
+
+
+def _draw_section_donut(slices: Dict[str, int], color_map: Dict[str, str], title: str, key: str) -> None:
+    """Draw one Section 4 donut by filling the cached template's trace.
     
-    # Fixed order for consistent legend: Kills, Touches, Block - No Kill, No Touch, Errors
-    block_order = ['Kills', 'Touches', 'Block - No Kill', 'No Touch', 'Errors']
-    block_color_map = {
-        'Kills': OUTCOME_COLORS['kill'],
-        'Touches': OUTCOME_COLORS['touch'],
-        'Block - No Kill': OUTCOME_COLORS['block_no_kill'],
-        'No Touch': OUTCOME_COLORS['no_touch'],
-        'Errors': OUTCOME_COLORS['error']
-    }
+    Only the slices and the title change between donuts, so the layout and
+    theme are never rebuilt per chart.
     
-    # Prepare data for all sets combined
-    all_blocks = df[df['action'] == 'block']
-    all_kills = len(all_blocks[all_blocks['outcome'] == 'kill'])
-    all_touches = len(all_blocks[all_blocks['outcome'] == 'touch'])
-    all_block_no_kill = len(all_blocks[all_blocks['outcome'] == 'block_no_kill'])
-    all_no_touch = len(all_blocks[all_blocks['outcome'] == 'no_touch'])
-    all_errors = len(all_blocks[all_blocks['outcome'] == 'error'])
-    all_total = all_kills + all_touches + all_block_no_kill + all_no_touch + all_errors
+    Args:
+        slices: Count per slice label, in legend order (empty slices are skipped)
+        color_map: Color per slice label
+        title: Chart title
+        key: Unique Streamlit key
+    """
+    labels = [label for label, count in slices.items() if count > 0]
+    if not labels:
+        return
     
-    # Create 4 columns: All Sets + one for each set
-    cols = st.columns(4)
+    figure = fill_donut(_section_donut_template(), labels, [slices[label] for label in labels],
+                        [color_map[label] for label in labels])
+    figure['layout']['title']['text'] = title
+    st.plotly_chart(figure, use_container_width=True, config=plotly_config, key=key)
+
+
+@st.cache_data(show_spinner=False)
+def _section_donut_template() -> dict:
+    """Build the styled (empty) Section 4 donut as a plotly JSON dict.
     
-    # All Sets donut chart
-    with cols[0]:
-        if all_total > 0:
-            labels = []
-            values = []
-            colors = []
-            
-            block_data = {
-                'Kills': all_kills,
-                'Touches': all_touches,
-                'Block - No Kill': all_block_no_kill,
-                'No Touch': all_no_touch,
-                'Errors': all_errors
-            }
-            
-            for block_type in block_order:
-                count = block_data[block_type]
-                if count > 0:
-                    labels.append(block_type)
-                    values.append(count)
-                    colors.append(block_color_map[block_type])
-            
-            if labels:
-                fig = go.Figure(data=[go.Pie(
-                    labels=labels,
-                    values=values,
-                    hole=0.4,
-                    marker=dict(colors=colors, line=dict(color='white', width=2)),
-                    textinfo='percent',  # Only show percentage, not label names
-                    textfont=dict(size=14, color='#050d76', family='Inter, sans-serif'),  # Larger font for percentages
-                    hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-                )])
-                fig.update_layout(
-                    title=f"All Sets (n={all_total})",
-                    height=CHART_HEIGHTS['large'],  # Larger chart
-                    showlegend=True,
-                    legend=dict(
-                        orientation="v",
-                        yanchor="top",
-                        y=1,
-                        xanchor="left",
-                        x=1.02,
-                        itemsizing='constant'  # Consistent legend item sizing
-                    ),
-                    margin=dict(l=0, r=100, t=50, b=0),  # Reduce margins for bigger chart
-                    font=dict(family='Inter, sans-serif', size=11, color='#050d76')
-                )
-                fig = apply_beautiful_theme(fig, "All Sets Block Performance")
-                st.plotly_chart(fig, use_container_width=True, config=plotly_config, key="block_donut_all")
+    ``st.cache_data`` hands out a fresh copy on every call.
     
-    # Individual set donut charts
-    for idx, set_num in enumerate(played_sets[:3], start=1):  # Limit to 3 sets (plus "All Sets" = 4 total)
-        if idx >= len(cols):
-            break
-        with cols[idx]:
-            set_df = df[df['set_number'] == set_num]
-            blocks_set = set_df[set_df['action'] == 'block']
-            
-            kills = len(blocks_set[blocks_set['outcome'] == 'kill'])
-            touches = len(blocks_set[blocks_set['outcome'] == 'touch'])
-            block_no_kill = len(blocks_set[blocks_set['outcome'] == 'block_no_kill'])
-            no_touch = len(blocks_set[blocks_set['outcome'] == 'no_touch'])
-            errors = len(blocks_set[blocks_set['outcome'] == 'error'])
-            total = kills + touches + block_no_kill + no_touch + errors
-            
-            if total > 0:
-                labels = []
-                values = []
-                colors = []
-                
-                block_data = {
-                    'Kills': kills,
-                    'Touches': touches,
-                    'Block - No Kill': block_no_kill,
-                    'No Touch': no_touch,
-                    'Errors': errors
-                }
-                
-                for block_type in block_order:
-                    count = block_data[block_type]
-                    if count > 0:
-                        labels.append(block_type)
-                        values.append(count)
-                        colors.append(block_color_map[block_type])
-                
-                if labels:
-                    fig = go.Figure(data=[go.Pie(
-                        labels=labels,
-                        values=values,
-                        hole=0.4,
-                        marker=dict(colors=colors, line=dict(color='white', width=2)),
-                        textinfo='percent',  # Only show percentage, not label names
-                        textfont=dict(size=14, color='#050d76', family='Inter, sans-serif'),  # Larger font for percentages
-                        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-                    )])
-                    fig.update_layout(
-                        title=f"Set {set_num} (n={total})",
-                        height=CHART_HEIGHTS['large'],  # Larger chart
-                        showlegend=True,
-                        legend=dict(
-                            orientation="v",
-                            yanchor="top",
-                            y=1,
-                            xanchor="left",
-                            x=1.02,
-                            itemsizing='constant'  # Consistent legend item sizing
-                        ),
-                        margin=dict(l=0, r=100, t=50, b=0),  # Reduce margins for bigger chart
-                        font=dict(family='Inter, sans-serif', size=11, color='#050d76')
-                    )
-                    fig = apply_beautiful_theme(fig, f"Set {set_num} Block Performance")
-                    st.plotly_chart(fig, use_container_width=True, config=plotly_config, key=f"block_donut_set_{set_num}")
-
+    Returns:
+        Plotly figure dict with one empty Pie trace and a placeholder title
+    """
+    fig = go.Figure(data=[go.Pie(
+        labels=[],
+        values=[],
+        hole=0.4,
+        marker=dict(line=dict(color='white', width=2)),
+        textinfo='percent',  # Only show percentage, not label names
+        textfont=dict(size=14, color='#050d76', family='Inter, sans-serif'),  # Larger font for percentages
+        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
+    )])
+    fig.update_layout(
+        height=CHART_HEIGHTS['large'],  # Larger chart
+        showlegend=True,
+        legend=dict(
+            orientation="v",
+            yanchor="top",
+            y=1,
+            xanchor="left",
+            x=1.02,
+            itemsizing='constant'  # Consistent legend item sizing
+        ),
+        margin=dict(l=0, r=100, t=50, b=0),  # Reduce margins for bigger chart
+        font=dict(family='Inter, sans-serif', size=11, color='#050d76')
+    )
+    fig = apply_beautiful_theme(fig, "Distribution")
+    return fig.to_plotly_json()
@@ -3,8 +3,16 @@ Chart utilities and theme configuration.
 
 Provides consistent styling for all Plotly charts in the dashboard.
 """
+from dataclasses import dataclass, field
+from functools import lru_cache
+import hashlib
+import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
-from typing import Optional, Dict, Any
+import plotly.io as pio
+import streamlit as st
+from typing import Optional, Dict, Any, List, Tuple
+from utils.helpers import get_player_position
 
 # Brand colors
 BRAND_PRIMARY = '#040C7B'
@@ -83,6 +91,201 @@ plotly_config = {
 }
 
 
+def frame_fingerprint(df: pd.DataFrame) -> Tuple[Any, ...]:
+    """Build a cheap, hashable signature of a match dataframe.
+    
+    Used as the ``hash_funcs`` entry for ``st.cache_data`` so cached chart data
+    is keyed on a vectorized content hash instead of Streamlit pickling the frame.
+    Every column is hashed, and the per-row hashes are digested in row order, so
+    a reordered frame or an edit to any column invalidates cached results.
+    
+    Args:
+        df: Match dataframe (or a slice of it)
+        
+    Returns:
+        Tuple of shape, column names and a digest of the row contents
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return (df.shape, tuple(df.columns), hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest())
+
+
+@dataclass
+class ChartContext:
+    """Per-render data shared by the skill chart modules.
+    
+    Built once by the section coordinator so sibling chart modules reuse the
+    played sets and column arrays instead of each rescanning the dataframe.
+    """
+    played_sets: List[int]
+    action_arr: np.ndarray
+    outcome_arr: np.ndarray
+    set_arr: np.ndarray
+    masks: Dict[str, np.ndarray] = field(default_factory=dict)
+    
+    @classmethod
+    def from_df(cls, df: pd.DataFrame, played_sets: List[int]) -> 'ChartContext':
+        """Create a context from a match dataframe and its played sets.
+        
+        Args:
+            df: Match dataframe
+            played_sets: Sets that were actually played
+            
+        Returns:
+            ChartContext over the dataframe's rows
+        """
+        return cls(
+            played_sets=played_sets,
+            action_arr=df['action'].to_numpy(),
+            outcome_arr=df['outcome'].to_numpy(),
+            set_arr=df['set_number'].to_numpy()
+        )
+    
+    def action_mask(self, action: str, set_num: Optional[int] = None) -> np.ndarray:
+        """Boolean row mask for one action, optionally limited to one set.
+        
+        The per-action mask is computed once and reused by every caller.
+        
+        Args:
+            action: Action name ('attack', 'receive', ...)
+            set_num: Optional set number to restrict to
+            
+        Returns:
+            Boolean array aligned with the dataframe rows
+        """
+        mask = self.masks.get(action)
+        if mask is None:
+            mask = self.masks[action] = self.action_arr == action
+        if set_num is not None:
+            mask = mask & (self.set_arr == set_num)
+        return mask
+
+
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def set_action_outcome_counts(df: pd.DataFrame) -> pd.DataFrame:
+    """Count rows per (set, action) and outcome in one groupby, cached across reruns.
+    
+    Chart modules read their outcome counts from this table instead of
+    masking the match dataframe for every set, action and outcome.
+    
+    Args:
+        df: Match dataframe
+        
+    Returns:
+        Counts indexed by (set_number, action) with one column per outcome
+    """
+    counts = df.groupby(['set_number', 'action', 'outcome'], sort=False, observed=True, dropna=False).size()
+    counts = counts.unstack('outcome', fill_value=0)
+    counts.columns = counts.columns.astype(str)
+    return counts
+
+
+def outcome_counts_by_set(df: pd.DataFrame, action: str) -> pd.DataFrame:
+    """Get the set x outcome count table for one action.
+    
+    Args:
+        df: Match dataframe
+        action: Action name ('attack', 'receive', ...)
+        
+    Returns:
+        Counts indexed by set_number with one column per outcome
+    """
+    counts = set_action_outcome_counts(df)
+    return counts[counts.index.get_level_values('action') == action].droplevel('action')
+
+
+def action_outcome_counts(df: pd.DataFrame, action: str, set_num: Optional[int] = None) -> pd.Series:
+    """Get one action's outcome counts for a set or the whole match.
+    
+    Args:
+        df: Match dataframe
+        action: Action name ('attack', 'receive', ...)
+        set_num: Optional set number to restrict to
+        
+    Returns:
+        Counts indexed by outcome (outcomes the action never had may be missing)
+    """
+    by_set = outcome_counts_by_set(df, action)
+    if set_num is not None:
+        by_set = by_set[by_set.index == set_num]
+    return by_set.sum()
+
+
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
+def player_position(df: pd.DataFrame, player_name: str) -> Optional[str]:
+    """Get a player's primary position, cached across reruns.
+    
+    Args:
+        df: Match dataframe
+        player_name: Name of the player
+        
+    Returns:
+        Primary position string or None if not found
+    """
+    return get_player_position(df, player_name)
+
+# plotly_white resolved once; assigning the Template object skips the per-figure registry lookup
+PLOTLY_WHITE_TEMPLATE = go.layout.Template(pio.templates['plotly_white'])
+
+# Legend placement per apply_beautiful_theme legend_position
+THEME_LEGEND_POSITIONS = {
+    'right': {'x': 1.02, 'y': 1, 'xanchor': 'left', 'yanchor': 'top'},
+    'bottom': {'x': 0.5, 'y': -0.15, 'xanchor': 'center', 'yanchor': 'top', 'orientation': 'h'},
+    'top': {'x': 0.5, 'y': 1.1, 'xanchor': 'center', 'yanchor': 'bottom', 'orientation': 'h'}
+}
+
+
+@lru_cache(maxsize=None)
+def _theme_layout(legend_position: str, show_grid: bool) -> Dict[str, Any]:
+    """Build the static part of the theme layout once per legend position and grid setting.
+    
+    The theme is applied as explicit layout properties (not as a layout.template)
+    so it keeps overriding what each chart set before calling apply_beautiful_theme.
+    Callers must copy the result before changing it.
+    """
+    axis = {
+        'gridcolor': '#E8F4F8' if show_grid else 'rgba(0,0,0,0)',
+        'gridwidth': 1,
+        'linecolor': '#BDC3C7',
+        'linewidth': 1,
+        'showgrid': show_grid,
+        'zeroline': False,
+        'title_font': {'size': 14, 'color': BRAND_PRIMARY},
+        'tickfont': {'size': 12, 'color': BRAND_PRIMARY}
+    }
+    layout = {
+        'template': PLOTLY_WHITE_TEMPLATE,
+        'font': BEAUTIFUL_TEMPLATE['layout']['font'],
+        'paper_bgcolor': 'rgba(255,255,255,0)',
+        'plot_bgcolor': '#FFFFFF',
+        'hovermode': 'x unified',
+        'hoverlabel': {
+            'bgcolor': '#FFFFFF',
+            'font_size': 13,
+            'font_color': BRAND_PRIMARY,
+            'bordercolor': BRAND_PRIMARY,
+            'font_family': 'Inter, sans-serif'
+        },
+        'xaxis': axis,
+        'yaxis': dict(axis),
+        'margin': {'l': 60, 'r': 40, 't': 70, 'b': 60}
+    }
+    
+    # Add legend unless hidden
+    if legend_position != 'none':
+        layout['legend'] = {
+            'bgcolor': 'rgba(255,255,255,0.95)',
+            'bordercolor': '#E8F4F8',
+            'borderwidth': 1,
+            'font': {'size': 13, 'color': BRAND_PRIMARY},
+            'itemsizing': 'constant',
+            **THEME_LEGEND_POSITIONS.get(legend_position, {})
+        }
+        layout['showlegend'] = True
+    else:
+        layout['showlegend'] = False
+    return layout
+
+
 def apply_beautiful_theme(
     fig: go.Figure, 
     title: Optional[str] = None, 
@@ -115,72 +318,14 @@ def apply_beautiful_theme(
     else:
         title_text = ''
     
-    # Legend positioning
-    legend_config = {
-        'bgcolor': 'rgba(255,255,255,0.95)',
-        'bordercolor': '#E8F4F8',
-        'borderwidth': 1,
-        'font': {'size': 13, 'color': BRAND_PRIMARY},
-        'itemsizing': 'constant'
-    }
-    
-    if legend_position == 'right':
-        legend_config.update({'x': 1.02, 'y': 1, 'xanchor': 'left', 'yanchor': 'top'})
-    elif legend_position == 'bottom':
-        legend_config.update({'x': 0.5, 'y': -0.15, 'xanchor': 'center', 'yanchor': 'top', 'orientation': 'h'})
-    elif legend_position == 'top':
-        legend_config.update({'x': 0.5, 'y': 1.1, 'xanchor': 'center', 'yanchor': 'bottom', 'orientation': 'h'})
-    
-    # Update layout with beautiful template
-    layout_update = {
-        'template': 'plotly_white',
-        'font': BEAUTIFUL_TEMPLATE['layout']['font'],
-        'paper_bgcolor': 'rgba(255,255,255,0)',
-        'plot_bgcolor': '#FFFFFF',
-        'hovermode': 'x unified',
-        'hoverlabel': {
-            'bgcolor': '#FFFFFF',
-            'font_size': 13,
-            'font_color': BRAND_PRIMARY,
-            'bordercolor': BRAND_PRIMARY,
-            'font_family': 'Inter, sans-serif'
-        },
-        'xaxis': {
-            'gridcolor': '#E8F4F8' if show_grid else 'rgba(0,0,0,0)',
-            'gridwidth': 1,
-            'linecolor': '#BDC3C7',
-            'linewidth': 1,
-            'showgrid': show_grid,
-            'zeroline': False,
-            'title_font': {'size': 14, 'color': BRAND_PRIMARY},
-            'tickfont': {'size': 12, 'color': BRAND_PRIMARY}
-        },
-        'yaxis': {
-            'gridcolor': '#E8F4F8' if show_grid else 'rgba(0,0,0,0)',
-            'gridwidth': 1,
-            'linecolor': '#BDC3C7',
-            'linewidth': 1,
-            'showgrid': show_grid,
-            'zeroline': False,
-            'title_font': {'size': 14, 'color': BRAND_PRIMARY},
-            'tickfont': {'size': 12, 'color': BRAND_PRIMARY}
-        },
-        'margin': {'l': 60, 'r': 40, 't': 70, 'b': 60},
-        'height': height or 450
-    }
-    
-    # Add legend unless hidden
-    if legend_position != 'none':
-        layout_update['legend'] = legend_config
-        layout_update['showlegend'] = True
-    else:
-        layout_update['showlegend'] = False
+    # Start from the layout prebuilt for this legend position and grid setting
+    layout_update = dict(_theme_layout(legend_position, show_grid), height=height or 450)
     
     # Add axis titles if provided
     if x_title:
-        layout_update['xaxis']['title'] = {'text': x_title, 'font': {'size': 14, 'color': BRAND_PRIMARY}}
+        layout_update['xaxis'] = dict(layout_update['xaxis'], title={'text': x_title, 'font': {'size': 14, 'color': BRAND_PRIMARY}})
     if y_title:
-        layout_update['yaxis']['title'] = {'text': y_title, 'font': {'size': 14, 'color': BRAND_PRIMARY}}
+        layout_update['yaxis'] = dict(layout_update['yaxis'], title={'text': y_title, 'font': {'size': 14, 'color': BRAND_PRIMARY}})
     
     # Add title only if we have valid title text
     if title_text:
@@ -200,6 +345,96 @@ def apply_beautiful_theme(
     return fig
 
 
+@st.cache_data(show_spinner=False)
+def donut_template(
+    title: str,
+    domain_y: Tuple[float, float] = (0.15, 0.95),
+    side_margin: int = 0,
+    autosize: Optional[bool] = None
+) -> go.Figure:
+    """Build the styled (empty) donut figure shared by the distribution charts.
+    
+    The layout only depends on these arguments, so it is built once per title
+    and callers fill the single Pie trace with ``update_traces``. ``st.cache_data``
+    hands out a fresh copy on every call, so the template is never mutated.
+    
+    Args:
+        title: Chart title shown above the donut
+        domain_y: Vertical domain of the pie within the plot area
+        side_margin: Left/right margin in pixels
+        autosize: Optional layout autosize flag
+        
+    Returns:
+        Figure with one empty Pie trace
+    """
+    fig = go.Figure(data=[go.Pie(
+        labels=[],
+        values=[],
+        hole=0.4,
+        marker=dict(line=dict(color='white', width=2)),
+        textinfo='percent+label',
+        textfont=dict(size=14, color='#050d76', family='Inter, sans-serif'),
+        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>',
+        domain=dict(x=[0, 1], y=list(domain_y))
+    )])
+    
+    fig = apply_beautiful_theme(fig, "", legend_position='bottom')
+    
+    fig.update_layout(
+        title=dict(text=title, font=dict(size=14, color='#050d76'), x=0.5, xanchor='center'),
+        height=350,
+        showlegend=False,
+        margin=dict(l=side_margin, r=side_margin, t=50, b=40)
+    )
+    if autosize is not None:
+        fig.update_layout(autosize=autosize)
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def donut_template_json(
+    title: str,
+    domain_y: Tuple[float, float] = (0.15, 0.95),
+    side_margin: int = 0,
+    autosize: Optional[bool] = None
+) -> Dict[str, Any]:
+    """Plotly JSON dict of ``donut_template``, for charts rendered straight from a dict.
+    
+    Filling the dict with ``fill_donut`` skips rebuilding and theming the Figure.
+    Like ``donut_template``, every call returns a fresh copy.
+    
+    Args:
+        title: Chart title shown above the donut
+        domain_y: Vertical domain of the pie within the plot area
+        side_margin: Left/right margin in pixels
+        autosize: Optional layout autosize flag
+        
+    Returns:
+        Figure dict with one empty Pie trace
+    """
+    return donut_template(title, domain_y, side_margin, autosize).to_plotly_json()
+
+
+def fill_donut(fig_dict: Dict[str, Any], labels: List[str], values: List[int],
+               colors: List[str]) -> Dict[str, Any]:
+    """Fill the single Pie trace of a donut figure dict in place.
+    
+    Args:
+        fig_dict: Figure dict with one Pie trace (e.g. from ``donut_template_json``)
+        labels: Slice labels, in legend order
+        values: Count per slice
+        colors: Color per slice
+        
+    Returns:
+        The same figure dict
+    """
+    trace = fig_dict['data'][0]
+    trace['labels'] = list(labels)
+    trace['values'] = list(values)
+    trace['marker'] = dict(trace.get('marker', {}), colors=list(colors))
+    return fig_dict
+
+
 def format_percentage_axis(fig: go.Figure, axis: str = 'y') -> go.Figure:
     """Format axis to display percentages properly.
     
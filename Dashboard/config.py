@@ -1,7 +1,7 @@
 """
 Configuration constants for the volleyball analytics dashboard
 """
-from typing import Dict, List
+from typing import Dict, FrozenSet, List
 
 # No Blockers Brand Color Palette - Updated to match brand colors
 CHART_COLORS: Dict[str, str] = {
@@ -164,6 +164,12 @@ ACTION_OUTCOME_MAP: Dict[str, List[str]] = {
     'free_ball': ['good', 'pass', 'error']  # Added 'pass' for free ball stayed on our side
 }
 
+# Outcome groups used in isin() filters (frozensets so membership checks are hashed)
+ATTACK_ERROR_OUTCOMES: FrozenSet[str] = frozenset({'blocked', 'out', 'net'})  # error removed
+GOOD_PASS_OUTCOMES: FrozenSet[str] = frozenset({'perfect', 'good'})  # Reception and dig
+GOOD_SET_OUTCOMES: FrozenSet[str] = frozenset({'exceptional', 'good'})
+SERVE_IN_OUTCOMES: FrozenSet[str] = frozenset({'ace', 'good'})
+
 # Human-readable labels for outcomes (for UI display)
 OUTCOME_LABELS: Dict[str, str] = {
     # Block outcomes
@@ -3,6 +3,8 @@ import numpy as np
 from datetime import datetime
 import os
 import logging
+from config import ATTACK_ERROR_OUTCOMES, GOOD_PASS_OUTCOMES, GOOD_SET_OUTCOMES
+from utils.helpers import optimize_match_dtypes, count_outcomes
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +39,7 @@ class MatchAnalyzer:
             True if successful, False otherwise
         """
         try:
-            self.match_data = pd.read_excel(filename, sheet_name='Raw_Data')
+            self.match_data = optimize_match_dtypes(pd.read_excel(filename, sheet_name='Raw_Data'))
             self.data_file = filename
             # Clear caches when new data is loaded
             self._attacks_cache = None
@@ -367,14 +369,15 @@ class MatchAnalyzer:
             attack_kills = len(attacks[attacks['outcome'] == 'kill'])
             # Attack errors include: blocked, out, net
             # Note: 'error' removed - all errors covered by 'out', 'net', 'blocked'
-            attack_errors = len(attacks[attacks['outcome'].isin(['blocked', 'out', 'net'])])
+            attack_errors = len(attacks[attacks['outcome'].isin(ATTACK_ERROR_OUTCOMES)])
             attack_attempts = len(attacks)
             attack_efficiency = (attack_kills - attack_errors) / attack_attempts if attack_attempts > 0 else 0
             
             # Service stats
             serves = player_data[player_data['action'] == 'serve']
-            service_aces = len(serves[serves['outcome'] == 'ace'])
-            service_errors = len(serves[serves['outcome'] == 'error'])
+            serve_counts = count_outcomes(serves['outcome'])
+            service_aces = int(serve_counts.get('ace', 0))
+            service_errors = int(serve_counts.get('error', 0))
             service_attempts = len(serves)
             service_efficiency = (service_aces - service_errors) / service_attempts if service_attempts > 0 else 0
             
@@ -388,14 +391,14 @@ class MatchAnalyzer:
             # Reception stats - using event-based outcomes (perfect, good, poor, error)
             receives = player_data[player_data['action'] == 'receive']
             # Good receptions = perfect + good (both count as good)
-            good_receives = len(receives[receives['outcome'].isin(['perfect', 'good'])])
+            good_receives = len(receives[receives['outcome'].isin(GOOD_PASS_OUTCOMES)])
             total_receives = len(receives)
             reception_percentage = good_receives / total_receives if total_receives > 0 else 0
             
             # Setting stats - using event-based outcomes (exceptional, good, poor, error)
             sets = player_data[player_data['action'] == 'set']
             # Good sets = exceptional + good (both count as good)
-            good_sets = len(sets[sets['outcome'].isin(['exceptional', 'good'])])
+            good_sets = len(sets[sets['outcome'].isin(GOOD_SET_OUTCOMES)])
             total_sets = len(sets)
             setting_percentage = good_sets / total_sets if total_sets > 0 else 0
             
@@ -445,21 +448,22 @@ class MatchAnalyzer:
             attack_kills = len(attacks[attacks['outcome'] == 'kill'])
             # Attack errors include: blocked, out, net
             # Note: 'error' removed - all errors covered by 'out', 'net', 'blocked'
-            attack_errors = len(attacks[attacks['outcome'].isin(['blocked', 'out', 'net'])])
+            attack_errors = len(attacks[attacks['outcome'].isin(ATTACK_ERROR_OUTCOMES)])
             attack_attempts = len(attacks)
             attack_efficiency = (attack_kills - attack_errors) / attack_attempts if attack_attempts > 0 else 0
             
             # Service stats
             serves = rotation_data[rotation_data['action'] == 'serve']
-            service_aces = len(serves[serves['outcome'] == 'ace'])
-            service_errors = len(serves[serves['outcome'] == 'error'])
+            serve_counts = count_outcomes(serves['outcome'])
+            service_aces = int(serve_counts.get('ace', 0))
+            service_errors = int(serve_counts.get('error', 0))
             service_attempts = len(serves)
             service_efficiency = (service_aces - service_errors) / service_attempts if service_attempts > 0 else 0
             
             # Reception stats - using event-based outcomes (perfect, good, poor, error)
             receives = rotation_data[rotation_data['action'] == 'receive']
             # Good receptions = perfect + good (both count as good)
-            good_receives = len(receives[receives['outcome'].isin(['perfect', 'good'])])
+            good_receives = len(receives[receives['outcome'].isin(GOOD_PASS_OUTCOMES)])
             total_receives = len(receives)
             reception_percentage = good_receives / total_receives if total_receives > 0 else 0
             
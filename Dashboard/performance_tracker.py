@@ -3,6 +3,7 @@ import numpy as np
 from datetime import datetime, timedelta
 import os
 import logging
+from utils.helpers import optimize_match_dtypes
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +38,8 @@ class PerformanceTracker:
                 logger.warning(f"Error loading {file}: {e}")
         
         if self.all_matches:
-            self.combined_data = pd.concat(self.all_matches, ignore_index=True)
+            # Categorical action/outcome like a single MatchAnalyzer load (categories unified after the concat)
+            self.combined_data = optimize_match_dtypes(pd.concat(self.all_matches, ignore_index=True))
             return True
         return False
     
@@ -7,7 +7,8 @@ ALL formulas must be defined here - no calculations should exist in UI modules.
 from typing import Dict, Any, Optional, Tuple
 import pandas as pd
 import logging
-from utils.helpers import filter_good_receptions, filter_good_digs, calculate_total_points_from_loader
+from config import ATTACK_ERROR_OUTCOMES, GOOD_PASS_OUTCOMES, GOOD_SET_OUTCOMES, SERVE_IN_OUTCOMES
+from utils.helpers import filter_good_receptions, filter_good_digs, calculate_total_points_from_loader, count_outcomes
 
 logger = logging.getLogger(__name__)
 
@@ -59,7 +60,7 @@ class KPICalculator:
         if self.analyzer and self.analyzer.match_data is not None:
             df = self.analyzer.match_data
             serves = df[df['action'] == 'serve']
-            in_play = len(serves[serves['outcome'].isin(['ace', 'good'])])
+            in_play = len(serves[serves['outcome'].isin(SERVE_IN_OUTCOMES)])
             total = len(serves)
             result = (in_play / total) if total > 0 else 0.0
             self._cache[cache_key] = result
@@ -127,7 +128,7 @@ class KPICalculator:
         if self.analyzer and self.analyzer.match_data is not None:
             df = self.analyzer.match_data
             digs = df[df['action'] == 'dig']
-            good = len(digs[digs['outcome'].isin(['good', 'perfect'])])
+            good = len(digs[digs['outcome'].isin(GOOD_PASS_OUTCOMES)])
             total = len(digs)
             result = (good / total) if total > 0 else 0.0
             self._cache[cache_key] = result
@@ -163,7 +164,7 @@ class KPICalculator:
         if self.analyzer and self.analyzer.match_data is not None:
             df = self.analyzer.match_data
             receives = df[df['action'] == 'receive']
-            good = len(receives[receives['outcome'].isin(['good', 'perfect'])])
+            good = len(receives[receives['outcome'].isin(GOOD_PASS_OUTCOMES)])
             total = len(receives)
             result = (good / total) if total > 0 else 0.0
             self._cache[cache_key] = result
@@ -270,7 +271,7 @@ class KPICalculator:
         # Fallback to analyzer - all error types: blocked, out, net
         if self.analyzer and self.analyzer.match_data is not None:
             attacks = self.analyzer.match_data[self.analyzer.match_data['action'] == 'attack']
-            errors = len(attacks[attacks['outcome'].isin(['blocked', 'out', 'net'])])
+            errors = len(attacks[attacks['outcome'].isin(ATTACK_ERROR_OUTCOMES)])
             total = len(attacks)
             result = (errors / total) if total > 0 else 0.0
             self._cache[cache_key] = result
@@ -589,7 +590,7 @@ class KPICalculator:
             
             if total_sets_count > 0:
                 # Good sets = exceptional + good (both count as good)
-                good_sets_count = len(sets[sets['outcome'].isin(['exceptional', 'good'])])
+                good_sets_count = len(sets[sets['outcome'].isin(GOOD_SET_OUTCOMES)])
                 value = good_sets_count / total_sets_count
                 if return_totals:
                     return {'value': value, 'numerator': good_sets_count, 'denominator': total_sets_count}
@@ -632,8 +633,9 @@ class KPICalculator:
         player_df = self._get_player_df(player_name)
         if not player_df.empty:
             serves = player_df[player_df['action'] == 'serve']
-            aces_count = len(serves[serves['outcome'] == 'ace'])
-            good_count = len(serves[serves['outcome'] == 'good'])
+            serve_counts = count_outcomes(serves['outcome'])
+            aces_count = int(serve_counts.get('ace', 0))
+            good_count = int(serve_counts.get('good', 0))
             in_play_count = aces_count + good_count
             attempts_count = len(serves)
             
@@ -737,7 +739,7 @@ class KPICalculator:
         player_df = self._get_player_df(player_name)
         if not player_df.empty:
             digs = player_df[player_df['action'] == 'dig']
-            good_count = len(digs[digs['outcome'].isin(['good', 'perfect'])])
+            good_count = len(digs[digs['outcome'].isin(GOOD_PASS_OUTCOMES)])
             attempts_count = len(digs)
             
             if attempts_count > 0:
@@ -197,6 +197,116 @@ class TestConfig:
             assert action in VALID_ACTIONS
 
 
+class TestMatchDtypes:
+    """Test the categorical dtype conversion of match columns."""
+    
+    def test_categories_keep_config_order(self):
+        """Test that known values keep the config order and extras follow them."""
+        import pandas as pd
+        from config import VALID_ACTIONS
+        from utils.helpers import optimize_match_dtypes
+        
+        df = optimize_match_dtypes(pd.DataFrame({'action': ['dig', 'warmup', 'serve', 'attack']}))
+        
+        assert list(df['action'].cat.categories) == VALID_ACTIONS + ['warmup']
+        assert df['action'].tolist() == ['dig', 'warmup', 'serve', 'attack']
+    
+    def test_set_number_downcast(self):
+        """Test that complete integer set numbers are downcast."""
+        import pandas as pd
+        from utils.helpers import optimize_match_dtypes
+        
+        df = optimize_match_dtypes(pd.DataFrame({'set_number': [1, 2, 3]}))
+        assert df['set_number'].dtype == 'int8'
+
+
+class TestCountOutcomes:
+    """Test outcome counting on plain and categorical columns."""
+    
+    def test_plain_and_categorical_agree(self):
+        """Test that categorical code counts match value_counts on strings."""
+        import pandas as pd
+        from utils.helpers import count_outcomes
+        
+        outcomes = pd.Series(['ace', 'error', 'good', None, 'ace'])
+        plain = count_outcomes(outcomes)
+        categorical = count_outcomes(outcomes.astype('category'))
+        
+        for outcome, expected in [('ace', 2), ('good', 1), ('error', 1)]:
+            assert int(plain.get(outcome, 0)) == expected
+            assert int(categorical.get(outcome, 0)) == expected
+    
+    def test_unused_category_counts_zero(self):
+        """Test that categories without rows count as zero."""
+        import pandas as pd
+        from utils.helpers import count_outcomes
+        
+        outcomes = pd.Series(pd.Categorical(['good'], categories=['ace', 'good', 'error']))
+        assert count_outcomes(outcomes).to_dict() == {'ace': 0, 'good': 1, 'error': 0}
+
+
+class TestPctBySet:
+    """Test the per-set percentage helper of the player charts."""
+    
+    def test_percentages_in_played_set_order(self):
+        """Test percentages per played set, with 0 for sets without rows."""
+        import pandas as pd
+        from charts.player_charts import _pct_by_set
+        
+        flags = pd.Series([True, False, True, True])
+        set_numbers = pd.Series([1, 1, 3, 3])
+        
+        assert _pct_by_set(flags, set_numbers, [1, 2, 3]) == [50.0, 0.0, 100.0]
+    
+    def test_rows_outside_played_sets_ignored(self):
+        """Test that rows from sets that are not reported are dropped."""
+        import pandas as pd
+        from charts.player_charts import _pct_by_set
+        
+        flags = pd.Series([True, False, True])
+        set_numbers = pd.Series([1, 2, 5])
+        
+        assert _pct_by_set(flags, set_numbers, [1, 2]) == [100.0, 0.0]
+
+
+class TestFrameFingerprint:
+    """Test the dataframe signature used as the chart cache key."""
+    
+    @staticmethod
+    def _match_frame():
+        import pandas as pd
+        return pd.DataFrame({
+            'set_number': [1, 1, 2],
+            'player': ['A', 'B', 'C'],
+            'action': ['serve', 'attack', 'receive'],
+            'outcome': ['ace', 'kill', 'good'],
+            'Attack_Type': ['', 'normal', '']
+        })
+    
+    def test_same_content_same_fingerprint(self):
+        """Test that equal frames share a fingerprint."""
+        from charts.utils import frame_fingerprint
+        
+        assert frame_fingerprint(self._match_frame()) == frame_fingerprint(self._match_frame())
+    
+    def test_permuted_rows_change_fingerprint(self):
+        """Test that reordering rows changes the fingerprint."""
+        from charts.utils import frame_fingerprint
+        
+        df = self._match_frame()
+        permuted = df.iloc[[1, 0, 2]].reset_index(drop=True)
+        assert frame_fingerprint(permuted) != frame_fingerprint(df)
+    
+    def test_edited_column_changes_fingerprint(self):
+        """Test that editing a column outside the groupby keys changes the fingerprint."""
+        from charts.utils import frame_fingerprint
+        
+        df = self._match_frame()
+        edited = df.copy()
+        edited.loc[1, 'Attack_Type'] = 'tip'
+        assert frame_fingerprint(edited) != frame_fingerprint(df)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -5,7 +5,8 @@ Extracted from generate_insights() for better organization.
 from typing import Dict, Any, List, Optional
 import pandas as pd
 from match_analyzer import MatchAnalyzer
-from utils.helpers import filter_block_touches, get_player_df
+from config import ATTACK_ERROR_OUTCOMES
+from utils.helpers import filter_block_touches, get_player_df, count_outcomes
 
 
 def get_player_position(df: pd.DataFrame, player: str) -> Optional[str]:
@@ -90,7 +91,7 @@ def _generate_set_by_set_insights(
         attacks = set_df[set_df['action'] == 'attack']
         if len(attacks) > 0:
             kills = len(attacks[attacks['outcome'] == 'kill'])
-            errors = len(attacks[attacks['outcome'].isin(['blocked', 'out', 'net'])])  # error removed
+            errors = len(attacks[attacks['outcome'].isin(ATTACK_ERROR_OUTCOMES)])  # error removed
             eff = (kills - errors) / len(attacks)
             set_attack_eff.append({'set': set_num, 'efficiency': eff})
     
@@ -142,8 +143,9 @@ def _generate_set_by_set_insights(
         set_df = df[df['set_number'] == set_num]
         serves = set_df[set_df['action'] == 'serve']
         if len(serves) > 0:
-            aces = len(serves[serves['outcome'] == 'ace'])
-            serv_errors = len(serves[serves['outcome'] == 'error'])
+            serve_counts = count_outcomes(serves['outcome'])
+            aces = int(serve_counts.get('ace', 0))
+            serv_errors = int(serve_counts.get('error', 0))
             set_service_stats.append({
                 'set': set_num,
                 'aces': aces,
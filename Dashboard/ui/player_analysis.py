@@ -9,14 +9,15 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from match_analyzer import MatchAnalyzer
-from config import SETTER_THRESHOLD, CHART_COLORS, KPI_TARGETS, OUTCOME_COLORS, CHART_HEIGHTS
+from config import SETTER_THRESHOLD, CHART_COLORS, KPI_TARGETS, OUTCOME_COLORS, CHART_HEIGHTS, ATTACK_ERROR_OUTCOMES
 from ui.components import (
     get_position_full_name, get_position_emoji, load_player_image_cached,
     display_player_image_and_info
 )
 from ui.premium_components import display_premium_section_header
 from ui.team_overview_helpers import _display_metric_styling
-from utils.helpers import get_player_position, get_player_df, filter_good_receptions, filter_good_digs, filter_block_touches
+from utils.helpers import (get_player_position, get_player_df, filter_good_receptions, filter_good_digs,
+                           filter_block_touches, count_outcomes)
 from utils.formatters import (
     format_percentage, get_performance_color,
     format_percentage_with_sample_size, get_sample_size_warning, should_hide_metric
@@ -264,10 +265,9 @@ def _display_player_participation(analyzer: MatchAnalyzer, player_name: str,
     player_df = get_player_df(df, player_name)
     
     # Calculate match participation
-    played_sets = sorted(player_df['set_number'].unique())
-    total_sets_in_match = sorted(df['set_number'].unique())
-    sets_played = len(played_sets)
-    total_sets = len(total_sets_in_match)
+    # Only the counts are needed, so skip sorting the set numbers
+    sets_played = player_df['set_number'].nunique(dropna=False)
+    total_sets = df['set_number'].nunique(dropna=False)
     
     # Calculate total actions and participation rate
     total_actions = player_data.get('total_actions', 0)
@@ -297,10 +297,9 @@ def _display_player_summary_card(analyzer: MatchAnalyzer, player_name: str, play
     is_setter = total_sets > 0 and total_sets >= player_data['total_actions'] * SETTER_THRESHOLD
     
     # Calculate match participation
-    played_sets = sorted(player_df['set_number'].unique())
-    total_sets_in_match = sorted(df['set_number'].unique())
-    sets_played = len(played_sets)
-    total_sets = len(total_sets_in_match)
+    # Only the counts are needed, so skip sorting the set numbers
+    sets_played = player_df['set_number'].nunique(dropna=False)
+    total_sets = df['set_number'].nunique(dropna=False)
     
     # Calculate total actions and participation rate
     total_actions = player_data.get('total_actions', 0)
@@ -377,7 +376,7 @@ def _create_mini_attack_kill_chart(player_df: pd.DataFrame, player_data: Dict[st
         values = [1]
         colors_list = ['#E0E0E0']
     else:
-        attack_errors = len(attacks[attacks['outcome'].isin(['blocked', 'out', 'net'])]) if len(attacks) > 0 else 0  # error removed
+        attack_errors = len(attacks[attacks['outcome'].isin(ATTACK_ERROR_OUTCOMES)]) if len(attacks) > 0 else 0  # error removed
         attack_good = attack_attempts - attack_kills - attack_errors
         
         if attack_kills > 0:
@@ -1620,9 +1619,10 @@ def _display_detailed_stats(player_name: str, player_data: Dict[str, Any], is_se
             st.markdown("#### 🎾 Service Statistics")
             serves = player_df[player_df['action'] == 'serve'] if not player_df.empty else pd.DataFrame()
             total_serves = len(serves)
-            service_aces = len(serves[serves['outcome'] == 'ace']) if len(serves) > 0 else 0
-            service_good = len(serves[serves['outcome'] == 'good']) if len(serves) > 0 else 0
-            service_errors = len(serves[serves['outcome'] == 'error']) if len(serves) > 0 else 0
+            serve_counts = count_outcomes(serves['outcome']) if len(serves) > 0 else pd.Series(dtype='int64')
+            service_aces = int(serve_counts.get('ace', 0))
+            service_good = int(serve_counts.get('good', 0))
+            service_errors = int(serve_counts.get('error', 0))
             
             total_serves_final = int(total_serves if total_serves > 0 else player_data.get('service_attempts', 0))
             service_aces_final = int(service_aces if service_aces > 0 else player_data.get('service_aces', 0))
@@ -1798,9 +1798,10 @@ def _display_detailed_stats(player_name: str, player_data: Dict[str, Any], is_se
             st.markdown("#### 🎾 Service Statistics")
             serves = player_df[player_df['action'] == 'serve'] if not player_df.empty else pd.DataFrame()
             total_serves = len(serves)
-            service_aces = len(serves[serves['outcome'] == 'ace']) if len(serves) > 0 else 0
-            service_good = len(serves[serves['outcome'] == 'good']) if len(serves) > 0 else 0
-            service_errors = len(serves[serves['outcome'] == 'error']) if len(serves) > 0 else 0
+            serve_counts = count_outcomes(serves['outcome']) if len(serves) > 0 else pd.Series(dtype='int64')
+            service_aces = int(serve_counts.get('ace', 0))
+            service_good = int(serve_counts.get('good', 0))
+            service_errors = int(serve_counts.get('error', 0))
             
             total_serves_final = int(total_serves if total_serves > 0 else player_data.get('service_attempts', 0))
             service_aces_final = int(service_aces if service_aces > 0 else player_data.get('service_aces', 0))
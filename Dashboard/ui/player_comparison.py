@@ -1,10 +1,9 @@
 """
 Player Comparison UI Module
 """
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Any, Optional, Tuple
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from match_analyzer import MatchAnalyzer
 from config import KPI_TARGETS, OUTCOME_COLORS, CHART_HEIGHTS
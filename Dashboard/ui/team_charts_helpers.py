@@ -9,8 +9,9 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from match_analyzer import MatchAnalyzer
-from config import CHART_COLORS
+from config import CHART_COLORS, ATTACK_ERROR_OUTCOMES
 from charts.utils import apply_beautiful_theme, plotly_config
+from utils.helpers import count_outcomes
 
 
 def _create_action_distribution_chart(df: pd.DataFrame) -> None:
@@ -100,13 +101,14 @@ def _calculate_set_metrics(df: pd.DataFrame) -> pd.DataFrame:
         # Attack efficiency
         attacks = set_df[set_df['action'] == 'attack']
         attack_kills = len(attacks[attacks['outcome'] == 'kill'])
-        attack_errors = len(attacks[attacks['outcome'].isin(['blocked', 'out', 'net'])])  # error removed
+        attack_errors = len(attacks[attacks['outcome'].isin(ATTACK_ERROR_OUTCOMES)])  # error removed
         attack_eff = (attack_kills - attack_errors) / len(attacks) if len(attacks) > 0 else 0
         
         # Service efficiency
         serves = set_df[set_df['action'] == 'serve']
-        service_aces = len(serves[serves['outcome'] == 'ace'])
-        service_errors = len(serves[serves['outcome'] == 'error'])
+        serve_counts = count_outcomes(serves['outcome'])
+        service_aces = int(serve_counts.get('ace', 0))
+        service_errors = int(serve_counts.get('error', 0))
         service_eff = (service_aces - service_errors) / len(serves) if len(serves) > 0 else 0
         
         # Errors
@@ -368,7 +370,7 @@ def _create_pass_quality_charts(df: pd.DataFrame, team_stats: Dict[str, Any]) ->
                 quality_attacks = df[(df['action'] == 'attack') & (df['pass_quality'] == quality)]
                 if len(quality_attacks) > 0:
                     kills = len(quality_attacks[quality_attacks['outcome'] == 'kill'])
-                    errors = len(quality_attacks[quality_attacks['outcome'].isin(['blocked', 'out', 'net'])])  # error removed
+                    errors = len(quality_attacks[quality_attacks['outcome'].isin(ATTACK_ERROR_OUTCOMES)])  # error removed
                     efficiency = (kills - errors) / len(quality_attacks)
                     pass_attack_stats.append({
                         'Pass Quality': quality_label,
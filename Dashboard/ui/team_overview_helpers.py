@@ -12,7 +12,7 @@ from services.session_manager import SessionStateManager
 from services.kpi_calculator import KPICalculator
 from utils.helpers import filter_good_receptions, filter_good_digs
 from utils.formatters import get_performance_color
-from config import KPI_TARGETS
+from config import KPI_TARGETS, ATTACK_ERROR_OUTCOMES
 import performance_tracker as pt
 
 
@@ -557,7 +557,7 @@ def _display_pass_quality_analysis(analyzer: MatchAnalyzer, team_stats: Dict[str
                     quality_attacks = df[(df['action'] == 'attack') & (df['pass_quality'] == quality)]
                     if len(quality_attacks) > 0:
                         kills = len(quality_attacks[quality_attacks['outcome'] == 'kill'])
-                        errors = len(quality_attacks[quality_attacks['outcome'].isin(['blocked', 'out', 'net'])])  # error removed
+                        errors = len(quality_attacks[quality_attacks['outcome'].isin(ATTACK_ERROR_OUTCOMES)])  # error removed
                         efficiency = (kills - errors) / len(quality_attacks)
                         pass_attack_stats.append({
                             'Pass Quality': quality_label,
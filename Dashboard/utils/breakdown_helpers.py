@@ -8,6 +8,22 @@ from utils.helpers import filter_good_receptions, filter_good_digs, filter_block
 from services.kpi_calculator import KPICalculator
 
 
+def _count_outcomes(outcomes, mask, names: List[str]) -> Dict[str, int]:
+    """Count rows matching each outcome name under a single composite mask.
+    
+    Args:
+        outcomes: Outcome column as a NumPy array
+        mask: Boolean array selecting the rows to count
+        names: Outcome names to count
+        
+    Returns:
+        Dict mapping each outcome name to its count, plus 'total'
+    """
+    counts = {name: int((mask & (outcomes == name)).sum()) for name in names}
+    counts['total'] = int(mask.sum())
+    return counts
+
+
 def get_attack_breakdown_by_type(df: pd.DataFrame, loader=None) -> Dict[str, Dict[str, int]]:
     """Get attack breakdown by attack type (normal, tip).
     
@@ -16,39 +32,26 @@ def get_attack_breakdown_by_type(df: pd.DataFrame, loader=None) -> Dict[str, Dic
         Each value is a dict with: 'kills', 'defended', 'blocked', 'out', 'net', 'total'
         Note: 'error' removed from attack outcomes - all errors covered by 'out', 'net', 'blocked'
     """
-    attacks = df[df['action'] == 'attack']
+    attack_mask = df['action'].to_numpy() == 'attack'
+    outcomes = df['outcome'].to_numpy()
     breakdown = {
         'normal': {'kills': 0, 'defended': 0, 'blocked': 0, 'out': 0, 'net': 0, 'total': 0},
         'tip': {'kills': 0, 'defended': 0, 'blocked': 0, 'out': 0, 'net': 0, 'total': 0}
     }
     
-    if 'Attack_Type' in attacks.columns:
-        for attack_type in ['normal', 'tip']:
-            type_attacks = attacks[attacks['Attack_Type'].str.lower().str.strip() == attack_type]
-            breakdown[attack_type]['kills'] = len(type_attacks[type_attacks['outcome'] == 'kill'])
-            breakdown[attack_type]['defended'] = len(type_attacks[type_attacks['outcome'] == 'defended'])
-            breakdown[attack_type]['blocked'] = len(type_attacks[type_attacks['outcome'] == 'blocked'])
-            breakdown[attack_type]['out'] = len(type_attacks[type_attacks['outcome'] == 'out'])
-            breakdown[attack_type]['net'] = len(type_attacks[type_attacks['outcome'] == 'net'])
-            breakdown[attack_type]['total'] = len(type_attacks)
-    elif 'attack_type' in attacks.columns:
-        # Handle lowercase column name (from match_data processing)
-        for attack_type in ['normal', 'tip']:
-            type_attacks = attacks[attacks['attack_type'].str.lower().str.strip() == attack_type]
-            breakdown[attack_type]['kills'] = len(type_attacks[type_attacks['outcome'] == 'kill'])
-            breakdown[attack_type]['defended'] = len(type_attacks[type_attacks['outcome'] == 'defended'])
-            breakdown[attack_type]['blocked'] = len(type_attacks[type_attacks['outcome'] == 'blocked'])
-            breakdown[attack_type]['out'] = len(type_attacks[type_attacks['outcome'] == 'out'])
-            breakdown[attack_type]['net'] = len(type_attacks[type_attacks['outcome'] == 'net'])
-            breakdown[attack_type]['total'] = len(type_attacks)
+    # Attack_Type from raw sheets, attack_type from match_data processing
+    type_column = next((c for c in ('Attack_Type', 'attack_type') if c in df.columns), None)
+    if type_column is not None:
+        attack_types = df[type_column].astype(str).str.lower().str.strip().to_numpy()
+        type_masks = {attack_type: attack_mask & (attack_types == attack_type) for attack_type in ['normal', 'tip']}
     else:
         # If Attack_Type column doesn't exist, assume all are 'normal'
-        breakdown['normal']['kills'] = len(attacks[attacks['outcome'] == 'kill'])
-        breakdown['normal']['defended'] = len(attacks[attacks['outcome'] == 'defended'])
-        breakdown['normal']['blocked'] = len(attacks[attacks['outcome'] == 'blocked'])
-        breakdown['normal']['out'] = len(attacks[attacks['outcome'] == 'out'])
-        breakdown['normal']['net'] = len(attacks[attacks['outcome'] == 'net'])
-        breakdown['normal']['total'] = len(attacks)
+        type_masks = {'normal': attack_mask}
+    
+    for attack_type, mask in type_masks.items():
+        counts = _count_outcomes(outcomes, mask, ['kill', 'defended', 'blocked', 'out', 'net'])
+        counts['kills'] = counts.pop('kill')
+        breakdown[attack_type].update(counts)
     
     return breakdown
 
@@ -59,15 +62,8 @@ def get_reception_breakdown_by_quality(df: pd.DataFrame, loader=None) -> Dict[st
     Returns:
         Dict with keys: 'perfect', 'good', 'poor', 'error', 'total'
     """
-    receives = df[df['action'] == 'receive']
-    breakdown = {
-        'perfect': len(receives[receives['outcome'] == 'perfect']),
-        'good': len(receives[receives['outcome'] == 'good']),
-        'poor': len(receives[receives['outcome'] == 'poor']),
-        'error': len(receives[receives['outcome'] == 'error']),
-        'total': len(receives)
-    }
-    return breakdown
+    return _count_outcomes(df['outcome'].to_numpy(), df['action'].to_numpy() == 'receive',
+                           ['perfect', 'good', 'poor', 'error'])
 
 
 def get_dig_breakdown_by_quality(df: pd.DataFrame, loader=None) -> Dict[str, int]:
@@ -76,15 +72,8 @@ def get_dig_breakdown_by_quality(df: pd.DataFrame, loader=None) -> Dict[str, int
     Returns:
         Dict with keys: 'perfect', 'good', 'poor', 'error', 'total'
     """
-    digs = df[df['action'] == 'dig']
-    breakdown = {
-        'perfect': len(digs[digs['outcome'] == 'perfect']),
-        'good': len(digs[digs['outcome'] == 'good']),
-        'poor': len(digs[digs['outcome'] == 'poor']),
-        'error': len(digs[digs['outcome'] == 'error']),
-        'total': len(digs)
-    }
-    return breakdown
+    return _count_outcomes(df['outcome'].to_numpy(), df['action'].to_numpy() == 'dig',
+                           ['perfect', 'good', 'poor', 'error'])
 
 
 def get_block_breakdown_by_outcome(df: pd.DataFrame, loader=None) -> Dict[str, int]:
@@ -93,16 +82,8 @@ def get_block_breakdown_by_outcome(df: pd.DataFrame, loader=None) -> Dict[str, i
     Returns:
         Dict with keys: 'kill', 'touch', 'block_no_kill', 'no_touch', 'error', 'total'
     """
-    blocks = df[df['action'] == 'block']
-    breakdown = {
-        'kill': len(blocks[blocks['outcome'] == 'kill']),
-        'touch': len(blocks[blocks['outcome'] == 'touch']),
-        'block_no_kill': len(blocks[blocks['outcome'] == 'block_no_kill']),
-        'no_touch': len(blocks[blocks['outcome'] == 'no_touch']),
-        'error': len(blocks[blocks['outcome'] == 'error']),
-        'total': len(blocks)
-    }
-    return breakdown
+    return _count_outcomes(df['outcome'].to_numpy(), df['action'].to_numpy() == 'block',
+                           ['kill', 'touch', 'block_no_kill', 'no_touch', 'error'])
 
 
 def get_serve_breakdown_by_outcome(df: pd.DataFrame, loader=None) -> Dict[str, int]:
@@ -111,14 +92,8 @@ def get_serve_breakdown_by_outcome(df: pd.DataFrame, loader=None) -> Dict[str, i
     Returns:
         Dict with keys: 'ace', 'good', 'error', 'total'
     """
-    serves = df[df['action'] == 'serve']
-    breakdown = {
-        'ace': len(serves[serves['outcome'] == 'ace']),
-        'good': len(serves[serves['outcome'] == 'good']),
-        'error': len(serves[serves['outcome'] == 'error']),
-        'total': len(serves)
-    }
-    return breakdown
+    return _count_outcomes(df['outcome'].to_numpy(), df['action'].to_numpy() == 'serve',
+                           ['ace', 'good', 'error'])
 
 
 def get_kpi_by_player(loader, kpi_name: str, return_totals: bool = False) -> Dict[str, Any]:
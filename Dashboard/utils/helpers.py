@@ -2,9 +2,46 @@
 Helper utility functions for data processing and player information
 """
 from typing import Optional, List
+import numpy as np
 import pandas as pd
 import re
 from datetime import datetime, date
+from config import GOOD_PASS_OUTCOMES, VALID_ACTIONS, VALID_OUTCOMES, VALID_ATTACK_TYPES
+
+# Low-cardinality match columns stored as pandas categoricals after loading, with their known values
+CATEGORICAL_COLUMNS = {
+    'action': VALID_ACTIONS,
+    'outcome': VALID_OUTCOMES,
+    'attack_type': VALID_ATTACK_TYPES
+}
+
+
+def optimize_match_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Store low-cardinality match columns in narrow dtypes.
+    
+    Equality filters, isin() and value_counts() on the categorical columns then
+    work on small integer codes instead of comparing strings row by row, and
+    set_number is downcast to the smallest integer type (int8 for real matches).
+    
+    Categories always include the known values from config, so every match
+    loads with the same codes; unexpected values are kept as extra categories.
+    
+    Args:
+        df: Match dataframe
+        
+    Returns:
+        The same dataframe with its columns converted
+    """
+    for col, known_values in CATEGORICAL_COLUMNS.items():
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            # Keep the config order (Index.union would sort) so ties and zero counts
+            # in value_counts() come out in the same order for every match
+            categories = list(known_values) + [v for v in df[col].dropna().unique() if v not in known_values]
+            df[col] = df[col].astype(pd.CategoricalDtype(categories))
+    # Only downcast complete integer columns; missing set numbers keep their float dtype
+    if 'set_number' in df.columns and pd.api.types.is_integer_dtype(df['set_number']):
+        df['set_number'] = pd.to_numeric(df['set_number'], downcast='integer')
+    return df
 
 
 def get_player_df(df: pd.DataFrame, player_name: str) -> pd.DataFrame:
@@ -20,10 +57,26 @@ def get_player_df(df: pd.DataFrame, player_name: str) -> pd.DataFrame:
     if df is None or df.empty or 'player' not in df.columns:
         return pd.DataFrame()
     
+    return df[get_player_mask(df, player_name)]
+
+
+def get_player_mask(df: pd.DataFrame, player_name: str) -> np.ndarray:
+    """Get a boolean row mask for a player (case-insensitive, whitespace-tolerant).
+    
+    Lets callers combine the player match with other conditions before slicing,
+    so the dataframe is copied only once.
+    
+    Args:
+        df: Match dataframe with player column
+        player_name: Name of the player to match
+        
+    Returns:
+        Boolean array aligned with the dataframe rows
+    """
     player_name_normalized = player_name.strip().lower()
     # Match case-insensitively and handle whitespace (fillna to handle None/NaN)
     player_col_normalized = df['player'].fillna('').astype(str).str.strip().str.lower()
-    return df[player_col_normalized == player_name_normalized]
+    return (player_col_normalized == player_name_normalized).to_numpy()
 
 
 def get_player_position(df: pd.DataFrame, player_name: str) -> Optional[str]:
@@ -186,7 +239,7 @@ def filter_good_receptions(df: pd.DataFrame) -> pd.DataFrame:
     if 'action' not in df.columns or 'outcome' not in df.columns:
         return pd.DataFrame()
     receives = df[df['action'] == 'receive']
-    return receives[receives['outcome'].isin(['perfect', 'good'])]
+    return receives[receives['outcome'].isin(GOOD_PASS_OUTCOMES)]
 
 
 def filter_good_digs(df: pd.DataFrame) -> pd.DataFrame:
@@ -201,7 +254,7 @@ def filter_good_digs(df: pd.DataFrame) -> pd.DataFrame:
     if 'action' not in df.columns or 'outcome' not in df.columns:
         return pd.DataFrame()
     digs = df[df['action'] == 'dig']
-    return digs[digs['outcome'].isin(['perfect', 'good'])]
+    return digs[digs['outcome'].isin(GOOD_PASS_OUTCOMES)]
 
 
 def filter_block_touches(df: pd.DataFrame) -> pd.DataFrame:
@@ -235,9 +288,9 @@ def count_good_outcomes(df: pd.DataFrame, action: str) -> int:
     action_df = df[df['action'] == action]
     
     if action == 'receive':
-        return len(action_df[action_df['outcome'].isin(['perfect', 'good'])])
+        return len(action_df[action_df['outcome'].isin(GOOD_PASS_OUTCOMES)])
     elif action == 'dig':
-        return len(action_df[action_df['outcome'].isin(['perfect', 'good'])])
+        return len(action_df[action_df['outcome'].isin(GOOD_PASS_OUTCOMES)])
     elif action == 'block':
         return len(action_df[action_df['outcome'] == 'touch'])
     elif action in ['serve', 'set']:
@@ -249,6 +302,25 @@ def count_good_outcomes(df: pd.DataFrame, action: str) -> int:
     return 0
 
 
+def count_outcomes(outcomes: pd.Series) -> pd.Series:
+    """Count rows per outcome in one pass.
+    
+    Categorical columns (see optimize_match_dtypes) are counted with one
+    np.bincount over their codes; other columns fall back to value_counts.
+    
+    Args:
+        outcomes: Outcome column (e.g. of the serve rows)
+        
+    Returns:
+        Counts indexed by outcome; read with ``.get(outcome, 0)``
+    """
+    if isinstance(outcomes.dtype, pd.CategoricalDtype):
+        codes = outcomes.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(outcomes.cat.categories))
+        return pd.Series(counts, index=outcomes.cat.categories)
+    return outcomes.value_counts()
+
+
 def extract_date_from_filename(filename: str) -> Optional[date]:
     """Extract date from filename (expects format with YYYY-MM-DD pattern).
     